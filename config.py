@@ -11,6 +11,77 @@ STATIC_FOLDER = os.path.join(PROJECT_ROOT, 'droneapp/static')
 DEBUG = False
 LOG_FILE = 'drone_simulation.log'
 
+# Camera streams: name -> ROS2 image topic, served at /api/camera/<name>/...
+# The 'camera' stream is also served at /api/camera/...
+CAMERA_STREAMS = {
+    'camera': '/camera',
+    # 'down': '/camera_down',
+    # 'thermal': '/thermal',
+}
+
+# Threads per camera that JPEG-encode new frames for live viewers, history
+# and recording; raise it when several resolutions are watched at once
+CAMERA_ENCODE_WORKERS = 2
+
+# Camera seek/replay history (0 seconds disables it). Opt-in: while enabled,
+# every frame of every camera is JPEG-encoded for it even with no viewers
+# (a few ms of CPU per frame at full size); CAMERA_HISTORY_WIDTH records a
+# smaller ladder rung to cut that (None = full size)
+CAMERA_HISTORY_SECONDS = 0
+CAMERA_HISTORY_MAX_BYTES = 64 * 1024 * 1024
+CAMERA_HISTORY_WIDTH = 320
+
+# Motion gate: the frame is split into a 32x24 grid, and a frame in which no
+# cell's mean grayscale value moved by the threshold (0-255) since the last
+# changed frame is marked unchanged; detection, history and recording skip it,
+# live views still get it. One frame in every CAMERA_MOTION_KEYFRAME_INTERVAL
+# counts as changed regardless (0 disables the gate)
+CAMERA_MOTION_THRESHOLD = 8.0
+CAMERA_MOTION_KEYFRAME_INTERVAL = 30
+
+# H.264 stream defaults (/api/camera/h264): target bitrate and frames between keyframes
+H264_KBPS = 250
+H264_KEYINT = 10
+
+# Live face detection: cameras to analyse, cascade input width and the
+# capture-to-result latency the detector adapts its frame skipping to hold
+FACE_DETECTION_CAMERAS = ['camera']
+FACE_DETECTION_WIDTH = 320
+FACE_DETECTION_TARGET_LATENCY = 0.2
+# 'tracking' runs the full cascade every FACE_DETECTION_FULL_EVERY frames and
+# follows faces in between; 'full' runs it on every analysed frame
+FACE_DETECTION_MODE = 'tracking'
+FACE_DETECTION_FULL_EVERY = 10
+FACE_DETECTION_EYES = True
+
+# Telemetry push stream (/api/telemetry/stream): maximum events per second per client
+TELEMETRY_STREAM_MAX_RATE = 10
+
+# Longest a /api/command/ request may block with ?wait_ms= for the vehicle's acknowledgement
+COMMAND_MAX_WAIT_MS = 10000
+
+# MAVSDK telemetry stream rates in Hz, overriding the defaults in
+# MAVSDKDroneBackend.TELEMETRY_RATES for the streams listed here
+TELEMETRY_RATES = {
+    # 'position_velocity_ned': 50.0,
+    # 'battery': 0.5,
+}
+
+# Binary log of telemetry and commands, one file per server run (tens of MB
+# per hour of flight). Off by default; when on, only the newest
+# FLIGHT_LOG_KEEP logs in FLIGHT_LOG_DIR are kept (0 keeps them all)
+FLIGHT_LOG_ENABLED = False
+FLIGHT_LOG_DIR = os.path.join(PROJECT_ROOT, 'flight_logs')
+FLIGHT_LOG_KEEP = 20
+# Replay a flight log instead of connecting to PX4, e.g.
+#   TELEMETRY_REPLAY=flight_logs/20240101_120000.flog TELEMETRY_REPLAY_SPEED=0 python main.py
+# (speed 1 = recorded timing, 0 = as fast as possible)
+TELEMETRY_REPLAY = os.environ.get('TELEMETRY_REPLAY')
+TELEMETRY_REPLAY_SPEED = float(os.environ.get('TELEMETRY_REPLAY_SPEED', '1'))
+
+# Camera flight recordings (one directory per recording)
+RECORDINGS_DIR = os.path.join(PROJECT_ROOT, 'recordings')
+
 app = Flask(__name__,
             template_folder=TEMPLATES,
             static_folder=STATIC_FOLDER)
@@ -1,11 +1,20 @@
 import logging
+import os
+import re
+import time
 
+from flask import abort
 from flask import jsonify
 from flask import render_template
 from flask import request
 
 from droneapp.models.mavsdk_backend import MAVSDKDroneBackend as VehicleCommand
 from droneapp.models.camera_stream import CameraStream
+from droneapp.models.command_queue import CommandQueueFull
+from droneapp.models.camera_recorder import RecordingReader
+from droneapp.models.face_detector import FaceDetector
+from droneapp.models.flight_log import prune_flight_logs
+from droneapp.models.video_stream import H264Stream
 from mavsdk_waypoint_navigator import MAVSDKNavigator
 from droneapp.models.ai_pilot import AIPilot
 
@@ -15,8 +24,29 @@ from datetime import datetime
 
 logger = logging.getLogger(__name__)
 app = config.app
-drone = VehicleCommand.get_instance()
-camera = CameraStream.get_instance()
+drone = VehicleCommand.get_instance(config.TELEMETRY_REPLAY, config.TELEMETRY_REPLAY_SPEED,
+                                    config.TELEMETRY_RATES)
+if config.FLIGHT_LOG_ENABLED and not config.TELEMETRY_REPLAY:
+    if config.FLIGHT_LOG_KEEP > 0:
+        # Make room for the log this run is about to start
+        prune_flight_logs(config.FLIGHT_LOG_DIR, config.FLIGHT_LOG_KEEP - 1)
+    drone.start_flight_log(os.path.join(config.FLIGHT_LOG_DIR,
+                                        f"{datetime.now().strftime('%Y%m%d_%H%M%S')}.flog"))
+for camera_name, camera_topic in config.CAMERA_STREAMS.items():
+    stream = CameraStream.get_instance(camera_name, camera_topic, config.CAMERA_ENCODE_WORKERS)
+    if config.CAMERA_HISTORY_SECONDS > 0:
+        stream.enable_history(config.CAMERA_HISTORY_SECONDS, config.CAMERA_HISTORY_MAX_BYTES,
+                              config.CAMERA_HISTORY_WIDTH)
+    if config.CAMERA_MOTION_THRESHOLD > 0:
+        stream.enable_motion_gate(config.CAMERA_MOTION_THRESHOLD, config.CAMERA_MOTION_KEYFRAME_INTERVAL)
+camera = CameraStream.get_instance()  # Default stream for the /api/camera/* routes
+detectors = {name: FaceDetector(CameraStream.get_instance(name),
+                                detect_width=config.FACE_DETECTION_WIDTH,
+                                target_latency=config.FACE_DETECTION_TARGET_LATENCY,
+                                mode=config.FACE_DETECTION_MODE,
+                                full_every=config.FACE_DETECTION_FULL_EVERY,
+                                detect_eyes=config.FACE_DETECTION_EYES)
+             for name in config.FACE_DETECTION_CAMERAS}
 navigator = MAVSDKNavigator()
 ai_pilot = AIPilot(drone, navigator)
 
@@ -62,80 +92,163 @@ def details():
 @app.route('/api/telemetry/')
 def telemetry():
     """Return telemetry data as JSON for visualization"""
-    this_drone = get_drone()
+    return jsonify(get_drone().get_telemetry())
 
-    # Get position and status from MAVSDK backend
-    position = this_drone.get_position()
-    status = this_drone.get_status()
-
-    telemetry_data = {
-        'altitude': position['altitude'],
-        'pitch': 0,  # Not yet implemented
-        'roll': 0,   # Not yet implemented
-        'yaw': 0,    # Not yet implemented
-        'battery': status['battery'],
-        'throttle': 0,
-        'position': {
-            'north': position['north'],
-            'east': position['east'],
-            'altitude': position['altitude']
-        },
-        'flight_mode': status['flight_mode'],
-        'in_air': status['in_air'],
-        'armed': status['armed'],
-        'connected': status['connected']
-    }
 
-    return jsonify(telemetry_data)
+@app.route('/api/telemetry/stream')
+def telemetry_stream():
+    """
+    Push telemetry as Server-Sent Events
+
+    Updates that arrive faster than the rate limit are coalesced, so each
+    client gets at most `rate` events per second carrying the latest state.
+
+    Query params:
+        rate: maximum events per second (default/max config.TELEMETRY_STREAM_MAX_RATE)
+    """
+    from flask import Response
+
+    this_drone = get_drone()
+    rate = request.args.get('rate', config.TELEMETRY_STREAM_MAX_RATE, type=float)
+    interval = 1.0 / max(0.1, min(rate, config.TELEMETRY_STREAM_MAX_RATE))
+
+    def generate():
+        last_seq = None
+        while True:
+            seq = this_drone.wait_for_telemetry(last_seq, timeout=15.0)
+            if seq == last_seq:
+                yield ': keepalive\n\n'
+                continue
+            sent = time.monotonic()
+            last_seq, payload = this_drone.get_telemetry_json()
+            yield f'id: {last_seq}\ndata: {payload}\n\n'
+
+            # Everything that changes until the next slot goes out as one event
+            delay = interval - (time.monotonic() - sent)
+            if delay > 0:
+                time.sleep(delay)
+
+    return Response(generate(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+
+@app.route('/api/telemetry/history')
+def telemetry_history():
+    """
+    Return a telemetry time range downsampled to min/mean/max per bucket
+
+    Query params:
+        start, end: epoch seconds (default: everything stored)
+        seconds: alternatively, the last N seconds
+        points: maximum number of buckets (default 500, max 5000)
+        fields: comma-separated columns (default: all, see TelemetryBuffer.COLUMNS)
+        format: 'json' (default) or 'bin': little-endian float32 rows of
+                [t - X-Time-Base, field min, mean, max, ...] in X-Columns order
+    """
+    from flask import Response
+
+    history = get_drone().telemetry_history
+    start = request.args.get('start', type=float)
+    end = request.args.get('end', type=float)
+    seconds = request.args.get('seconds', type=float)
+    if seconds is not None:
+        start, end = time.time() - seconds, None
+    points = max(1, min(5000, request.args.get('points', 500, type=int)))
+    fields = request.args.get('fields')
+    fields = [f for f in fields.split(',') if f] if fields else None
+    if fields and any(f not in history.COLUMNS for f in fields):
+        return jsonify(status='error', message=f'Unknown field; available: {", ".join(history.COLUMNS)}'), 400
+
+    data = history.downsample(start, end, points, fields)
+    timestamps = data.pop('timestamp')
+
+    if request.args.get('format') == 'bin':
+        import numpy as np
+        time_base = float(timestamps[0]) if len(timestamps) else 0.0
+        columns = [(timestamps - time_base).astype(np.float32)]
+        names = ['t']
+        for name, stats in data.items():
+            for stat in ('min', 'mean', 'max'):
+                columns.append(stats[stat].astype(np.float32))
+                names.append(f'{name}.{stat}')
+        body = np.column_stack(columns).astype('<f4').tobytes()
+        return Response(body, mimetype='application/octet-stream',
+                        headers={'X-Time-Base': repr(time_base), 'X-Columns': ','.join(names)})
+
+    return jsonify(timestamp=timestamps.tolist(),
+                   fields={name: {stat: values.tolist() for stat, values in stats.items()}
+                           for name, stats in data.items()},
+                   stats=history.get_stats())
 
 
 @app.route('/api/command/', methods=['POST'])
 def command():
+    """
+    Queue a vehicle command
+
+    With wait_ms, block until the vehicle acknowledges the command (or the
+    wait runs out); otherwise return as soon as it is queued. The returned
+    id can be polled at /api/command/<id>.
+    """
+    received = time.monotonic()
     cmd = request.form.get('command')
+    wait_ms = request.values.get('wait_ms', 0, type=float)
     logger.info({'action': 'command', 'cmd': cmd})
 
     try:
         this_drone = get_drone()
 
-        # MAVSDK commands
-        if cmd == 'arm':
-            this_drone.arm()
-        elif cmd == 'takeOff' or cmd == 'takeoff':
-            this_drone.takeoff(2)
-        elif cmd == 'land':
-            this_drone.land()
-        elif cmd == 'emergency_stop':
-            this_drone.emergency_stop()
-        # Manual control commands (offboard mode)
-        elif cmd == 'up':
-            this_drone.up()
-        elif cmd == 'down':
-            this_drone.down()
-        elif cmd == 'forward':
-            this_drone.forward()
-        elif cmd == 'back':
-            this_drone.back()
-        elif cmd == 'left':
-            this_drone.left()
-        elif cmd == 'right':
-            this_drone.right()
-        elif cmd == 'clockwise':
-            this_drone.clockwise()
-        elif cmd == 'counterclockwise':
-            this_drone.counterclockwise()
-        elif cmd == 'stop':
-            this_drone.stop()
-        # Legacy commands (not implemented)
-        elif cmd == 'speed':
-            speed = request.form.get('speed')
-            logger.info({'action': 'command', 'cmd': cmd, 'speed': speed})
-        elif cmd in ['serv_up', 'serv_down', 'activate']:
-            logger.info(f"Servo command not implemented: {cmd}")
-        else:
-            logger.warning(f"Unknown command: {cmd}")
-
-        return jsonify(status='success'), 200
-
+        handle = None
+        # Command latency is measured from here
+        with this_drone.commands.received_at(received):
+            # MAVSDK commands
+            if cmd == 'arm':
+                handle = this_drone.arm()
+            elif cmd == 'takeOff' or cmd == 'takeoff':
+                handle = this_drone.takeoff(2)
+            elif cmd == 'land':
+                handle = this_drone.land()
+            elif cmd == 'emergency_stop':
+                handle = this_drone.emergency_stop()
+            elif cmd == 'emergency_land':
+                handle = this_drone.emergency_stop(land=True)
+            # Manual control commands (offboard mode)
+            elif cmd == 'up':
+                handle = this_drone.up()
+            elif cmd == 'down':
+                handle = this_drone.down()
+            elif cmd == 'forward':
+                handle = this_drone.forward()
+            elif cmd == 'back':
+                handle = this_drone.back()
+            elif cmd == 'left':
+                handle = this_drone.left()
+            elif cmd == 'right':
+                handle = this_drone.right()
+            elif cmd == 'clockwise':
+                handle = this_drone.clockwise()
+            elif cmd == 'counterclockwise':
+                handle = this_drone.counterclockwise()
+            elif cmd == 'stop':
+                handle = this_drone.stop()
+            # Legacy commands (not implemented)
+            elif cmd == 'speed':
+                speed = request.form.get('speed')
+                logger.info({'action': 'command', 'cmd': cmd, 'speed': speed})
+            elif cmd in ['serv_up', 'serv_down', 'activate']:
+                logger.info(f"Servo command not implemented: {cmd}")
+            else:
+                logger.warning(f"Unknown command: {cmd}")
+
+        if handle is None:
+            return jsonify(status='success'), 200
+        if wait_ms > 0:
+            handle.wait(min(wait_ms, config.COMMAND_MAX_WAIT_MS) / 1000)
+        return command_response(handle)
+
+    except CommandQueueFull as e:
+        logger.warning(f"Command rejected, queue full: {cmd}")
+        return jsonify(status='busy', message=f"Too many pending commands ({e})"), 429
     except ConnectionError as e:
         logger.error(f"Connection error: {e}")
         return jsonify(status='error', message=str(e)), 503
@@ -144,6 +257,34 @@ def command():
         return jsonify(status='error', message=f"Command failed: {str(e)}"), 500
 
 
+def command_response(handle):
+    """JSON reply for a command handle; the HTTP status follows its state"""
+    if handle.state in ('queued', 'running'):
+        return jsonify(status='pending', command=handle.to_dict()), 202
+    if handle.state == 'failed':
+        return jsonify(status='error', message=f"Command failed: {handle.error}",
+                       command=handle.to_dict()), 500
+    if handle.state in ('cancelled', 'dropped'):
+        return jsonify(status='cancelled', message=f"Command {handle.state} by an emergency stop",
+                       command=handle.to_dict()), 409
+    return jsonify(status='success', command=handle.to_dict()), 200
+
+
+@app.route('/api/command/<int:command_id>')
+def command_status(command_id):
+    """Return the status of a recent command"""
+    handle = get_drone().commands.get(command_id)
+    if handle is None:
+        return jsonify(status='error', message=f"Unknown command id: {command_id}"), 404
+    return command_response(handle)
+
+
+@app.route('/api/command/stats')
+def command_stats():
+    """Return command queue statistics with per-command latency"""
+    return jsonify(get_drone().get_command_stats())
+
+
 @app.route('/api/chat/', methods=['POST'])
 def chat():
     """Handle natural language chat commands with Claude AI"""
@@ -169,29 +310,347 @@ def chat():
         return jsonify(response="Error processing command. Please check that ANTHROPIC_API_KEY is set.", status='error'), 500
 
 
+def get_camera(name=None):
+    """Look up a camera stream by name (None = default stream), or abort with 404"""
+    cam = camera if name is None else CameraStream.get_stream(name)
+    if cam is None:
+        response = jsonify(status='error', message=f"Unknown camera: {name}")
+        response.status_code = 404
+        abort(response)
+    return cam
+
+
+@app.route('/api/camera/')
+def camera_list():
+    """List camera streams"""
+    return jsonify(status='success', default=camera.name,
+                   cameras=[{'name': cam.name, 'topic': cam.topic, 'frame_id': cam.frame_id}
+                            for cam in CameraStream.all_streams().values()])
+
+
+def camera_variant_args(cam):
+    """Parse ?width=&quality=&fmt= camera encoding parameters"""
+    variant = {
+        'width': request.args.get('width', type=int),
+        'quality': request.args.get('quality', type=int),
+        'fmt': request.args.get('fmt', 'jpeg'),
+    }
+    cam.normalize_variant(**variant)  # Raises ValueError on bad fmt
+    return variant
+
+
 @app.route('/api/camera/feed')
-def camera_feed():
-    """Return latest camera frame as JPEG"""
+@app.route('/api/camera/<name>/feed')
+def camera_feed(name=None):
+    """
+    Return latest camera frame as JPEG
+
+    Query params:
+        width, quality, fmt: encoding ladder rung (see CameraStream.get_frame)
+        after: long-poll until a frame newer than this id exists
+        timeout: long-poll timeout in seconds (default 10, max 30)
+
+    Honours If-None-Match against the frame ETag with 304 Not Modified.
+    The frame id is returned in the X-Frame-Id header.
+    """
+    cam = get_camera(name)
     try:
         from flask import Response
-        frame = camera.get_frame()
-        return Response(frame, mimetype='image/jpeg')
+
+        variant = camera_variant_args(cam)
+
+        after = request.args.get('after', type=int)
+        if after is not None:
+            timeout = min(request.args.get('timeout', 10.0, type=float), 30.0)
+            cam.wait_for_frame_id(after, timeout)
+
+        # Check the ETag before encoding so unchanged frames cost nothing
+        etag = cam.get_etag(cam.frame_id, **variant)
+        if request.if_none_match.contains(etag):
+            response = Response(status=304)
+            response.set_etag(etag)
+            return response
+
+        frame_id, frame = cam.get_frame_with_id(**variant)
+        response = Response(frame, mimetype=cam.FORMATS[variant['fmt']][1])
+        response.set_etag(cam.get_etag(frame_id, **variant))
+        response.headers['X-Frame-Id'] = str(frame_id)
+        response.headers['Cache-Control'] = 'no-cache'
+        return response
+    except ValueError as e:
+        return jsonify(status='error', message=str(e)), 400
     except Exception as e:
         logger.error(f"Camera feed error: {e}")
         return jsonify(status='error', message=str(e)), 500
 
 
 @app.route('/api/camera/stream')
-def camera_stream():
+@app.route('/api/camera/<name>/stream')
+def camera_stream(name=None):
     """Return camera feed as base64 JSON for AJAX polling"""
+    cam = get_camera(name)
     try:
-        frame_base64 = camera.get_frame_base64()
+        frame_base64 = cam.get_frame_base64(request.args.get('width', type=int),
+                                            request.args.get('quality', type=int))
         return jsonify(frame=frame_base64, status='success')
     except Exception as e:
         logger.error(f"Camera stream error: {e}")
         return jsonify(status='error', message=str(e)), 500
 
 
+@app.route('/api/camera/mjpeg')
+@app.route('/api/camera/<name>/mjpeg')
+def camera_mjpeg(name=None):
+    """
+    Push camera frames as a multipart/x-mixed-replace MJPEG stream
+
+    Query params:
+        width, quality: encoding ladder rung, e.g. ?width=320&quality=50 for weak links
+    """
+    from flask import Response
+
+    cam = get_camera(name)
+    width = request.args.get('width', type=int)
+    quality = request.args.get('quality', type=int)
+
+    def generate():
+        # Subscribing lets the encoder pool prepare frames before we ask
+        variant = cam.subscribe(width, quality)
+        try:
+            last_id = 0
+            part = None
+            while cam.running:
+                frame_id, frame = cam.wait_for_frame(last_id, timeout=1.0,
+                                                     width=width, quality=quality)
+                if frame is not None:
+                    last_id = frame_id
+                    part = (b'--frame\r\n'
+                            b'Content-Type: image/jpeg\r\n'
+                            b'Content-Length: ' + str(len(frame)).encode() + b'\r\n\r\n' +
+                            frame + b'\r\n')
+                # Without a new frame, send the last one again: a closed
+                # connection is only noticed on a write
+                if part is not None:
+                    yield part
+        finally:
+            cam.unsubscribe(variant)
+
+    return Response(generate(), mimetype='multipart/x-mixed-replace; boundary=frame')
+
+
+@app.route('/api/camera/h264')
+@app.route('/api/camera/<name>/h264')
+def camera_h264(name=None):
+    """
+    Stream the camera as H.264 through a shared ffmpeg encoder
+
+    Query params:
+        container: 'mp4' (fragmented MP4, default) or 'h264' (raw Annex-B)
+        width: ladder rung to encode (default full size)
+        kbps: target bitrate (default config.H264_KBPS)
+        keyint: frames between keyframes (default config.H264_KEYINT); clients
+                join at a keyframe, and MP4 fragments are one keyframe interval long
+    """
+    from flask import Response
+
+    cam = get_camera(name)
+    width = request.args.get('width', type=int)
+    kbps = max(32, min(8000, request.args.get('kbps', config.H264_KBPS, type=int)))
+    keyint = max(1, min(300, request.args.get('keyint', config.H264_KEYINT, type=int)))
+    try:
+        stream, client = H264Stream.subscribe(cam, width, kbps, keyint,
+                                              request.args.get('container', 'mp4'))
+    except ImportError as e:
+        return jsonify(status='error', message=f'H.264 streaming unavailable: {e}'), 503
+    except ValueError as e:
+        return jsonify(status='error', message=str(e)), 400
+
+    def generate():
+        try:
+            while stream.running:
+                data = client.get(timeout=1.0)
+                if data is None:
+                    # Keep writing so a closed connection is noticed
+                    data = stream.keepalive(client)
+                if data is not None:
+                    yield data
+        finally:
+            stream.unsubscribe(client)
+
+    return Response(generate(), mimetype=stream.mimetype)
+
+
+@app.route('/api/camera/stats')
+@app.route('/api/camera/<name>/stats')
+def camera_stats(name=None):
+    """Return camera ingest and encoder statistics"""
+    cam = get_camera(name)
+    stats = cam.get_stats()
+    stats['h264'] = H264Stream.camera_stats(cam)
+    return jsonify(stats)
+
+
+@app.route('/api/camera/history')
+@app.route('/api/camera/<name>/history')
+def camera_history(name=None):
+    """
+    List frames kept in the camera history
+
+    Query params:
+        start, end: unix timestamp range (inclusive)
+        seconds: alternatively, the last N seconds
+    """
+    cam = get_camera(name)
+    if cam.history is None:
+        return jsonify(status='error', message='Camera history is disabled'), 404
+
+    start = request.args.get('start', type=float)
+    end = request.args.get('end', type=float)
+    seconds = request.args.get('seconds', type=float)
+    if seconds is not None:
+        start = time.time() - seconds
+
+    frames = cam.history.list_frames(start, end)
+    return jsonify(status='success',
+                   frames=[{'id': frame_id, 'timestamp': timestamp, 'bytes': size}
+                           for frame_id, timestamp, size in frames])
+
+
+@app.route('/api/camera/history/<int:frame_id>')
+@app.route('/api/camera/<name>/history/<int:frame_id>')
+def camera_history_frame(frame_id, name=None):
+    """Return a frame from the camera history as JPEG"""
+    from flask import Response
+
+    cam = get_camera(name)
+    frame = cam.history.get_frame(frame_id) if cam.history else None
+    if frame is None:
+        return jsonify(status='error', message=f'Frame {frame_id} not in history'), 404
+
+    response = Response(frame.data, mimetype='image/jpeg')
+    response.headers['X-Frame-Id'] = str(frame.frame_id)
+    response.headers['X-Frame-Timestamp'] = str(frame.timestamp)
+    response.headers['Cache-Control'] = 'max-age=3600'
+    return response
+
+
+def recording_path(name):
+    """Resolve a recording name inside config.RECORDINGS_DIR"""
+    if not re.fullmatch(r'[A-Za-z0-9_.-]+', name) or name.startswith('.'):
+        raise ValueError(f"Invalid recording name: {name}")
+    return os.path.join(config.RECORDINGS_DIR, name)
+
+
+@app.route('/api/camera/recording', methods=['GET', 'POST'])
+@app.route('/api/camera/<name>/recording', methods=['GET', 'POST'])
+def camera_recording(name=None):
+    """
+    Get recording status, or start/stop recording
+
+    POST form params:
+        action: 'start' or 'stop'
+        name: recording name (default: <camera>_<timestamp>)
+        width, quality: encoding ladder rung to record
+    """
+    cam = get_camera(name)
+    try:
+        if request.method == 'POST':
+            action = request.form.get('action')
+            if action == 'start':
+                recording = (request.form.get('name') or
+                             f"{cam.name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
+                cam.start_recording(recording_path(recording),
+                                    width=request.form.get('width', type=int),
+                                    quality=request.form.get('quality', 85, type=int))
+            elif action == 'stop':
+                cam.stop_recording()
+            else:
+                return jsonify(status='error', message=f"Unknown action: {action}"), 400
+
+        recorder = cam.recorder
+        return jsonify(status='success', recording=recorder.get_stats() if recorder else None)
+    except (ValueError, RuntimeError) as e:
+        return jsonify(status='error', message=str(e)), 400
+
+
+@app.route('/api/camera/recordings/<name>/frames')
+def camera_recording_frames(name):
+    """List recorded frames, optionally within ?start=&end= (unix timestamps)"""
+    try:
+        reader = RecordingReader(recording_path(name))
+    except (ValueError, FileNotFoundError) as e:
+        return jsonify(status='error', message=str(e)), 404
+
+    try:
+        frames = reader.list_frames(request.args.get('start', type=float),
+                                    request.args.get('end', type=float))
+        return jsonify(status='success',
+                       frames=[{'id': frame_id, 'timestamp': timestamp, 'bytes': size}
+                               for frame_id, timestamp, size in frames])
+    finally:
+        reader.close()
+
+
+@app.route('/api/camera/recordings/<name>/frame')
+def camera_recording_frame(name):
+    """Return a recorded frame by ?id= or the first frame at or after ?t="""
+    from flask import Response
+
+    try:
+        reader = RecordingReader(recording_path(name))
+    except (ValueError, FileNotFoundError) as e:
+        return jsonify(status='error', message=str(e)), 404
+
+    try:
+        frame_id = request.args.get('id', type=int)
+        if frame_id is not None:
+            index = reader.find_frame_id(frame_id)
+        else:
+            index = reader.find_time(request.args.get('t', 0.0, type=float))
+        if index is None or index >= len(reader):
+            return jsonify(status='error', message='Frame not found'), 404
+
+        frame_id, timestamp, data = reader.read(index)
+        response = Response(data, mimetype='image/jpeg')
+        response.headers['X-Frame-Id'] = str(frame_id)
+        response.headers['X-Frame-Timestamp'] = str(timestamp)
+        return response
+    finally:
+        reader.close()
+
+
+@app.route('/api/detections/')
+@app.route('/api/detections/<int:frame_id>')
+def detections(frame_id=None):
+    """
+    Return face detections (boxes in source pixels) for the latest analysed
+    frame, or for a specific frame id
+
+    Query params:
+        camera: camera name (default stream if omitted)
+        after: long-poll until a frame newer than this id has been analysed
+        timeout: long-poll timeout in seconds (default 10, max 30)
+    """
+    cam = get_camera(request.args.get('camera'))
+    detector = detectors.get(cam.name)
+    if detector is None or not detector.available:
+        return jsonify(status='error', message=f"Face detection is not running on '{cam.name}'"), 404
+
+    after = request.args.get('after', type=int)
+    if frame_id is not None:
+        result = detector.get_result(frame_id)
+    elif after is not None:
+        timeout = min(request.args.get('timeout', 10.0, type=float), 30.0)
+        result = detector.wait_for_result(after, timeout)
+    else:
+        result = detector.get_result()
+
+    if result is None:
+        return jsonify(status='error', message='No detection result for this frame',
+                       stats=detector.get_stats()), 404
+    return jsonify(status='success', detection=result, stats=detector.get_stats())
+
+
 @app.route('/api/run_waypoint_test/', methods=['POST'])
 def run_waypoint_test():
     """Run the waypoint navigation test (3m square pattern)"""
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Camera Recorder
+---------------
+Persists encoded camera frames to rolling segment files with a fixed-width,
+memory-mapped index for O(log n) seeking.
+
+Recording layout:
+  <recording>/segment_00000.mjpg   concatenated encoded frames
+  <recording>/index.bin            one INDEX_RECORD per frame, in frame order
+"""
+
+import bisect
+import mmap
+import os
+import queue
+import struct
+import threading
+
+# timestamp (s), frame id, segment number, byte offset, byte length
+INDEX_RECORD = struct.Struct('<dQIQI')
+INDEX_FILE = 'index.bin'
+
+
+def segment_path(path, segment):
+    return os.path.join(path, f"segment_{segment:05d}.mjpg")
+
+
+class CameraRecorder:
+    """Append-only frame recorder with a background batching writer"""
+
+    def __init__(self, path, segment_bytes=64 * 1024 * 1024, queue_size=256, batch_size=32):
+        self.path = path
+        self.segment_bytes = segment_bytes
+        self.batch_size = batch_size
+        # Frame ids restart with every process, so appending to an earlier
+        # recording would break the index order find_frame_id() relies on
+        if os.path.exists(os.path.join(path, INDEX_FILE)):
+            raise RuntimeError(f"Recording already exists: {path}")
+        os.makedirs(path, exist_ok=True)
+
+        # Capture threads only enqueue; a full queue drops frames instead of blocking
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.frames_written = 0
+        self.frames_dropped = 0
+        self.frames_late = 0
+        self.bytes_written = 0
+        # The index is searched by bisection, so frames must be queued in
+        # order; encoder workers can deliver them out of order
+        self._order_lock = threading.Lock()
+        self._last_frame_id = None
+        self.running = True
+
+        self._index_file = open(os.path.join(path, INDEX_FILE), 'ab')
+        self._segment = 0
+        self._segment_file = open(segment_path(path, self._segment), 'ab')
+        self._offset = self._segment_file.tell()
+
+        self.thread = threading.Thread(target=self._write_loop, name="camera-recorder", daemon=True)
+        self.thread.start()
+
+    def append(self, frame_id, timestamp, data):
+        """Queue an encoded frame for writing (never blocks); frames older than the last one are dropped"""
+        if not self.running:
+            return
+        with self._order_lock:
+            if self._last_frame_id is not None and frame_id <= self._last_frame_id:
+                self.frames_late += 1
+                return
+            try:
+                self.queue.put_nowait((frame_id, timestamp, data))
+            except queue.Full:
+                self.frames_dropped += 1
+                return
+            self._last_frame_id = frame_id
+
+    def _next_batch(self):
+        """Block for one frame, then take whatever else is already queued"""
+        try:
+            batch = [self.queue.get(timeout=0.5)]
+        except queue.Empty:
+            return []
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self.queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _write_loop(self):
+        """Writer thread: one data write and one index write per batch"""
+        while self.running or not self.queue.empty():
+            batch = self._next_batch()
+            if not batch:
+                continue
+            try:
+                self._write_batch(batch)
+            except Exception as e:
+                print(f"Camera recorder write error: {e}")
+                self._reopen()
+
+        self._segment_file.close()
+        self._index_file.close()
+
+    def _write_batch(self, batch):
+        chunks = []
+        records = []
+        # _offset only moves once the data is written
+        offset = self._offset
+        for frame_id, timestamp, data in batch:
+            if offset and offset + len(data) > self.segment_bytes:
+                # Roll over to a new segment
+                self._segment_file.writelines(chunks)
+                self._segment_file.close()
+                chunks = []
+                self._segment += 1
+                self._segment_file = open(segment_path(self.path, self._segment), 'ab')
+                self._offset = offset = 0
+
+            chunks.append(data)
+            records.append(INDEX_RECORD.pack(timestamp, frame_id, self._segment, offset, len(data)))
+            offset += len(data)
+
+        self._segment_file.writelines(chunks)
+        self._segment_file.flush()
+        self._offset = offset
+        # Index entries are written only after their data is flushed
+        self._index_file.write(b''.join(records))
+        self._index_file.flush()
+        self.frames_written += len(batch)
+        self.bytes_written += sum(len(data) for _, _, data in batch)
+
+    def _reopen(self):
+        """After a failed write, continue from what actually reached the disk"""
+        for f in (self._segment_file, self._index_file):
+            try:
+                f.close()
+            except OSError:
+                pass
+        try:
+            self._segment_file = open(segment_path(self.path, self._segment), 'ab')
+            self._offset = self._segment_file.tell()
+            # Drop a partially written index record
+            self._index_file = open(os.path.join(self.path, INDEX_FILE), 'ab')
+            size = self._index_file.tell()
+            self._index_file.truncate(size - size % INDEX_RECORD.size)
+        except OSError as e:
+            print(f"Camera recorder reopen error: {e}")
+
+    def stop(self):
+        """Flush queued frames and close the recording"""
+        self.running = False
+        self.thread.join(timeout=5)
+
+    def get_stats(self):
+        """Get recorder statistics"""
+        return {
+            'path': self.path,
+            'recording': self.running,
+            'segment': self._segment,
+            'frames_written': self.frames_written,
+            'frames_dropped': self.frames_dropped,
+            'frames_late': self.frames_late,
+            'bytes_written': self.bytes_written,
+            'queued': self.queue.qsize(),
+        }
+
+
+class _IndexField:
+    """Sequence view over one field of the mmapped index (for bisect)"""
+
+    def __init__(self, reader, field):
+        self.reader = reader
+        self.field = field
+
+    def __len__(self):
+        return len(self.reader)
+
+    def __getitem__(self, i):
+        return self.reader.record(i)[self.field]
+
+
+class RecordingReader:
+    """Random access to a recording through its memory-mapped index"""
+
+    def __init__(self, path):
+        if not os.path.isdir(path):
+            raise FileNotFoundError(f"Recording not found: {path}")
+        self.path = path
+        self._index = None
+        self._count = 0
+        self._segments = {}
+        self.refresh()
+
+    def refresh(self):
+        """Re-map the index to pick up frames appended since opening"""
+        index_path = os.path.join(self.path, INDEX_FILE)
+        size = os.path.getsize(index_path) if os.path.exists(index_path) else 0
+        count = size // INDEX_RECORD.size
+        if count == self._count:
+            return
+        if self._index is not None:
+            self._index.close()
+        with open(index_path, 'rb') as f:
+            self._index = mmap.mmap(f.fileno(), count * INDEX_RECORD.size, access=mmap.ACCESS_READ)
+        self._count = count
+
+    def __len__(self):
+        return self._count
+
+    def record(self, i):
+        """Index record i as (timestamp, frame_id, segment, offset, length)"""
+        if not 0 <= i < self._count:
+            raise IndexError(i)
+        return INDEX_RECORD.unpack_from(self._index, i * INDEX_RECORD.size)
+
+    def find_time(self, timestamp):
+        """Index of the first frame at or after timestamp"""
+        return bisect.bisect_left(_IndexField(self, 0), timestamp)
+
+    def find_frame_id(self, frame_id):
+        """Index of frame_id, or None if it was not recorded"""
+        i = bisect.bisect_left(_IndexField(self, 1), frame_id)
+        if i < self._count and self.record(i)[1] == frame_id:
+            return i
+        return None
+
+    def read(self, i):
+        """Read frame i as (frame_id, timestamp, data)"""
+        timestamp, frame_id, segment, offset, length = self.record(i)
+        fd = self._segments.get(segment)
+        if fd is None:
+            fd = self._segments[segment] = os.open(segment_path(self.path, segment), os.O_RDONLY)
+        return frame_id, timestamp, os.pread(fd, length, offset)
+
+    def list_frames(self, start=None, end=None):
+        """[(frame_id, timestamp, length), ...] for start <= timestamp <= end"""
+        lo = 0 if start is None else self.find_time(start)
+        hi = self._count if end is None else bisect.bisect_right(_IndexField(self, 0), end)
+        frames = []
+        for i in range(lo, hi):
+            timestamp, frame_id, _, _, length = self.record(i)
+            frames.append((frame_id, timestamp, length))
+        return frames
+
+    def __iter__(self):
+        for i in range(self._count):
+            yield self.read(i)
+
+    def close(self):
+        if self._index is not None:
+            self._index.close()
+            self._index = None
+        for fd in self._segments.values():
+            os.close(fd)
+        self._segments = {}
@@ -2,68 +2,187 @@
 """
 ROS2 Camera Stream
 ------------------
-Subscribes to ROS2 camera topic (bridged from Gazebo) and serves images via Flask
+Subscribes to ROS2 camera topics (bridged from Gazebo) and serves images via Flask.
+Each named stream has its own buffers and encoder pool; all streams share
+one rclpy executor (see ros_bridge.py).
 """
 
 import io
 import threading
 import time
 import base64
+from collections import Counter, OrderedDict
 from PIL import Image
 import numpy as np
 
+from droneapp.models.camera_recorder import CameraRecorder
+from droneapp.models.frame_history import FrameHistory
+from droneapp.models.frame_preprocess import FramePreprocess
+from droneapp.models.metrics import LatencyStats
+from droneapp.models.motion_gate import MotionGate
+from droneapp.models.ros_bridge import RosCameraBridge
+
+
+class FrameBufferRing:
+    """Fixed ring of preallocated frame buffers for one (shape, raw mode)"""
+
+    def __init__(self, shape, size):
+        self.buffers = [np.empty(shape, dtype=np.uint8) for _ in range(size)]
+        self.next = 0
+
+    @property
+    def nbytes(self):
+        return sum(buf.nbytes for buf in self.buffers)
+
+    def acquire(self, is_free):
+        """Return the next buffer for which is_free(buffer) holds, or None"""
+        for _ in range(len(self.buffers)):
+            buf = self.buffers[self.next]
+            self.next = (self.next + 1) % len(self.buffers)
+            if is_free(buf):
+                return buf
+        return None
+
 
 class CameraStream:
-    """Singleton camera stream handler"""
+    """Named camera stream handler (one instance per camera topic)"""
 
-    _instance = None
+    _streams = {}
     _lock = threading.Lock()
+    DEFAULT_NAME = 'camera'
+
+    # Requested widths are snapped up to one of these rungs so that clients
+    # asking for similar sizes share the same downscaled image and encoding
+    WIDTH_LADDER = (160, 320, 480, 640, 960, 1280)
+    FORMATS = {
+        'jpeg': ('JPEG', 'image/jpeg'),
+        'webp': ('WEBP', 'image/webp'),
+    }
+    ENCODE_CACHE_SIZE = 16
+
+    # ROS2 encoding -> (channels, PIL raw mode). Raw frames are kept as
+    # (array, raw mode) and channel reordering happens inside the decoder
+    # that feeds the encoder, so ingest never reorders or converts pixels.
+    ROS_ENCODINGS = {
+        'rgb8': (3, 'RGB'),
+        'bgr8': (3, 'BGR'),
+        'rgba8': (4, 'RGBX'),
+        'mono8': (1, 'L'),
+        'grayscale': (1, 'L'),
+    }
+    # Latest frame + one being written + frames pinned by in-flight encodes
+    FRAME_RING_SIZE = 4
+    # Default number of threads that pre-encode new frames for subscribed variants
+    ENCODE_WORKERS = 2
+
+    # Shown until the first frame arrives
+    EMPTY_FRAME = (np.zeros((480, 640, 3), dtype=np.uint8), 'RGB')
 
     @classmethod
-    def get_instance(cls):
-        if cls._instance is None:
+    def get_instance(cls, name=None, topic=None, encode_workers=None):
+        """
+        Get the named stream, creating it on first use
+
+        Args:
+            name: stream name (default: DEFAULT_NAME, subscribed to /camera)
+            topic: ROS2 image topic (default: /<name>)
+            encode_workers: encoder threads when creating it (default: ENCODE_WORKERS)
+        """
+        name = name or cls.DEFAULT_NAME
+        stream = cls._streams.get(name)
+        if stream is None:
             with cls._lock:
-                if cls._instance is None:
-                    cls._instance = cls()
-        return cls._instance
+                if name not in cls._streams:
+                    cls._streams[name] = cls(name, topic or f"/{name}", encode_workers)
+                stream = cls._streams[name]
+        return stream
 
-    def __init__(self):
-        self.latest_frame = None
-        self.frame_lock = threading.Lock()
-        self.running = False
-        self.ros2_available = False
-        self.frame_count = 0
+    @classmethod
+    def get_stream(cls, name):
+        """Get an existing stream by name, or None"""
+        return cls._streams.get(name)
 
-        # For ROS2 callback
-        self.latest_msg = None
-        self.msg_lock = threading.Lock()
+    @classmethod
+    def all_streams(cls):
+        """All registered streams by name"""
+        return dict(cls._streams)
+
+    def __init__(self, name=DEFAULT_NAME, topic='/camera', encode_workers=None):
+        self.name = name
+        self.topic = topic
+        self.latest_raw = None
+        # Monotonically increasing id of latest_raw; epoch distinguishes
+        # ids across server restarts (used for HTTP ETags)
+        self.frame_id = 0
+        self.frame_time = None
+        self.frame_size = None
+        # Whether the motion gate found latest_raw unchanged, and the id of
+        # the newest frame it did not (see changed_since())
+        self.frame_unchanged = False
+        self.changed_frame_id = 0
+        self.epoch = int(time.time())
+        self.frame_lock = threading.Lock()
+        self.frame_cond = threading.Condition(self.frame_lock)
+
+        # LRU of encoded frames keyed by (frame_id, width, quality, fmt),
+        # encodes in progress (so concurrent requesters share one), and the
+        # preprocessing cache (RGB, pyramid, grayscale) of the current frame
+        self.jpeg_quality = 85
+        self.cache_lock = threading.Lock()
+        self._encode_cache = OrderedDict()
+        self._inflight = {}
+        self.preprocess_lock = threading.Lock()
+        self._preprocess = None
+        self.preprocess_stats = {'image': 0, 'gray': 0, 'hits': 0}
+        self._encode_buffers = threading.local()
+
+        # Encoder pool: new frames are handed off latest-wins to workers that
+        # pre-encode every subscribed variant (guarded by frame_lock)
+        self.encode_cond = threading.Condition(self.frame_lock)
+        self._pending = None
+        self._subscribers = Counter()
+        self._listeners = []
+        self.encode_workers = []
+        self.encode_latency = LatencyStats()
+        self.capture_latency = LatencyStats()
+        self.encode_dropped = 0
+
+        # Optional seek/replay history and on-disk recording, fed by the encoder pool
+        self.history = None
+        self.recorder = None
+        self._recorder_listener = None
+
+        # Preallocated ingest buffers keyed by (height, width, raw mode);
+        # buffers in use by readers or the writer are pinned (guarded by frame_lock)
+        self._rings = {}
+        self._pins = Counter()
+        self.frames_dropped = 0
+
+        # Optional change gate: every frame is still published (live views
+        # stay smooth), but frames that barely differ from the last changed
+        # one are marked unchanged and skipped by detection, history and recording
+        self.motion_gate = None
 
-        # Try to import ROS2
-        try:
-            import rclpy
-            from sensor_msgs.msg import Image as RosImage
-
-            self.rclpy = rclpy
-            self.RosImage = RosImage
-            self.ros2_available = True
-            print("📷 ROS2 available")
-        except ImportError as e:
-            print(f"⚠️ ROS2 not available, using placeholder: {e}")
-            self.ros2_available = False
-
-        # Start camera capture thread
-        self.thread = threading.Thread(target=self._capture_loop, daemon=True)
-        self.thread.start()
-
-    def _capture_loop(self):
-        """Capture camera frames from ROS2"""
         self.running = True
-        print("📷 Camera stream started")
+        self.frame_count = 0
+
+        for i in range(encode_workers or self.ENCODE_WORKERS):
+            worker = threading.Thread(target=self._encode_loop, name=f"{name}-encoder-{i}", daemon=True)
+            worker.start()
+            self.encode_workers.append(worker)
+        print(f"📷 Camera stream '{name}' started")
 
+        # Subscribe through the shared ROS2 executor, or fall back to a placeholder
+        self.bridge = RosCameraBridge.get_instance()
+        self.ros2_available = self.bridge.available
         if self.ros2_available:
-            self._ros2_camera_loop()
-        else:
-            self._placeholder_loop()
+            try:
+                self.bridge.subscribe_images(topic, self._image_callback, self._publish_placeholder)
+            except Exception as e:
+                print(f"ROS2 camera error: {e}, falling back to placeholder")
+                self.ros2_available = False
+        if not self.ros2_available:
+            self._publish_placeholder()
 
     def _image_callback(self, msg):
         """ROS2 callback for camera images"""
@@ -73,137 +192,432 @@ class CameraStream:
             height = msg.height
             encoding = msg.encoding
 
-            # Convert image data to numpy array
-            img_data = np.frombuffer(msg.data, dtype=np.uint8)
-
-            # Handle different encodings
-            if encoding == 'rgb8':
-                img_array = img_data.reshape((height, width, 3))
-                img = Image.fromarray(img_array, 'RGB')
-            elif encoding == 'rgba8':
-                img_array = img_data.reshape((height, width, 4))
-                img = Image.fromarray(img_array, 'RGBA').convert('RGB')
-            elif encoding == 'bgr8':
-                img_array = img_data.reshape((height, width, 3))
-                # Convert BGR to RGB
-                img_array = img_array[:, :, ::-1]
-                img = Image.fromarray(img_array, 'RGB')
-            elif encoding == 'mono8' or encoding == 'grayscale':
-                img_array = img_data.reshape((height, width))
-                img = Image.fromarray(img_array, 'L').convert('RGB')
-            else:
+            if encoding not in self.ROS_ENCODINGS:
                 print(f"⚠️ Unsupported encoding: {encoding}")
                 return
+            channels, raw_mode = self.ROS_ENCODINGS[encoding]
+            shape = (height, width, channels) if channels > 1 else (height, width)
 
-            # Convert to JPEG
-            buffer = io.BytesIO()
-            img.save(buffer, format='JPEG', quality=85)
-            buffer.seek(0)
+            # View the message data without copying; rows may be padded to msg.step
+            row_bytes = width * channels
+            src = np.frombuffer(msg.data, dtype=np.uint8, count=height * msg.step)
+            src = src.reshape((height, msg.step))[:, :row_bytes].reshape(shape)
 
+            self.frame_count += 1
             with self.frame_lock:
-                self.latest_frame = buffer.getvalue()
+                buf = self._acquire_buffer(shape, raw_mode)
+            if buf is None:
+                # Every buffer is still being read; drop rather than allocate
+                self.frames_dropped += 1
+                return
 
-            self.frame_count += 1
+            try:
+                # Only frames that get published may move the gate's reference
+                unchanged = self.motion_gate is not None and not self.motion_gate.update(src)
+                np.copyto(buf, src)
+                self._set_frame((buf, raw_mode), unchanged)
+            finally:
+                with self.frame_lock:
+                    self._unpin(buf)
 
             # Log first frame received
             if self.frame_count == 1:
-                print(f"✅ First camera frame received: {width}x{height}, encoding={encoding}")
+                print(f"✅ First camera frame on {self.topic}: {width}x{height}, encoding={encoding}")
 
         except Exception as e:
             print(f"Image callback error: {e}")
             import traceback
             traceback.print_exc()
 
-    def _ros2_camera_loop(self):
-        """Capture frames using ROS2 subscriber"""
+    def _publish_placeholder(self):
+        """Publish a placeholder image when Gazebo is not available"""
+        # The placeholder never changes, so it is published once; publishing
+        # it again would only force clients to re-download the same image
         try:
-            # Initialize ROS2 in this thread
-            self.rclpy.init()
-
-            # Create a minimal node
-            node = self.rclpy.create_node('camera_stream_node')
+            # Create placeholder image
+            img = Image.new('RGB', (640, 480), color=(42, 45, 42))
 
-            # Subscribe to /camera topic
-            subscription = node.create_subscription(
-                self.RosImage,
-                '/camera',
-                self._image_callback,
-                10  # QoS depth
-            )
+            # Add text overlay
+            from PIL import ImageDraw, ImageFont
+            draw = ImageDraw.Draw(img)
+            try:
+                font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 24)
+            except:
+                font = ImageFont.load_default()
 
-            print("✅ Subscribed to ROS2 /camera topic, waiting for frames...")
+            draw.text((180, 200), "Camera Feed", fill=(253, 185, 19), font=font)
+            draw.text((140, 240), "Waiting for ROS2...", fill=(200, 200, 200), font=font)
 
-            # Spin to process callbacks
-            while self.running:
-                self.rclpy.spin_once(node, timeout_sec=0.1)
+            # Add instructions
+            try:
+                small_font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 14)
+            except:
+                small_font = font
+            draw.text((100, 300), "Start ros_gz_bridge and PX4 SITL", fill=(150, 150, 150), font=small_font)
+            draw.text((100, 330), f"Topic: {self.topic}", fill=(150, 150, 150), font=small_font)
 
-            # Cleanup
-            node.destroy_node()
-            self.rclpy.shutdown()
+            self._set_frame((np.asarray(img), 'RGB'))
 
         except Exception as e:
-            print(f"ROS2 camera error: {e}, falling back to placeholder")
-            import traceback
-            traceback.print_exc()
-            self._placeholder_loop()
-
-    def _placeholder_loop(self):
-        """Generate placeholder images when Gazebo is not available"""
+            print(f"Placeholder generation error: {e}")
+
+    def _acquire_buffer(self, shape, raw_mode):
+        """Pin and return a free ingest buffer (caller holds frame_lock)"""
+        key = (shape, raw_mode)
+        ring = self._rings.get(key)
+        if ring is None:
+            ring = self._rings[key] = FrameBufferRing(shape, self.FRAME_RING_SIZE)
+
+        latest = self.latest_raw[0] if self.latest_raw else None
+        buf = ring.acquire(lambda b: b is not latest and not self._pins[id(b)])
+        if buf is not None:
+            self._pin(buf)
+        return buf
+
+    def _pin(self, buf):
+        """Mark buffer as in use (caller holds frame_lock)"""
+        self._pins[id(buf)] += 1
+
+    def _unpin(self, buf):
+        """Release a buffer pinned with _pin (caller holds frame_lock)"""
+        self._pins[id(buf)] -= 1
+        if not self._pins[id(buf)]:
+            del self._pins[id(buf)]
+
+    def _read_latest(self):
+        """Pin and return (frame_id, raw) of the latest frame (caller holds frame_lock)"""
+        raw = self.latest_raw if self.latest_raw is not None else self.EMPTY_FRAME
+        self._pin(raw[0])
+        return self.frame_id, raw
+
+    def _encode_pinned(self, frame_id, raw, width, quality, fmt):
+        """Encode a frame returned by _read_latest and release its buffer"""
+        try:
+            return self._get_encoded(frame_id, raw, width, quality, fmt)
+        finally:
+            with self.frame_lock:
+                self._unpin(raw[0])
+
+    def _set_frame(self, raw, unchanged=False):
+        """Publish a new raw (array, mode) frame and wake up waiting consumers"""
+        with self.frame_cond:
+            self.latest_raw = raw
+            self.frame_id += 1
+            self.frame_time = time.time()
+            self.frame_size = (raw[0].shape[1], raw[0].shape[0])
+            self.frame_unchanged = unchanged
+            if not unchanged:
+                self.changed_frame_id = self.frame_id
+            self.frame_cond.notify_all()
+
+            if self._subscribers:
+                if self._pending is not None:
+                    # Latest wins: the workers never got to the previous frame.
+                    # A change in it is carried over, so history and
+                    # recording still get a frame showing it
+                    self._unpin(self._pending[1][0])
+                    unchanged = unchanged and self._pending[4]
+                    self.encode_dropped += 1
+                self._pin(raw[0])
+                self._pending = (self.frame_id, raw, self.frame_time, time.monotonic(), unchanged)
+                self.encode_cond.notify()
+
+    def _encode_loop(self):
+        """Encoder worker: pre-encode the newest frame for every subscribed variant"""
         while self.running:
-            try:
-                # Create placeholder image
-                img = Image.new('RGB', (640, 480), color=(42, 45, 42))
-
-                # Add text overlay
-                from PIL import ImageDraw, ImageFont
-                draw = ImageDraw.Draw(img)
-                try:
-                    font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 24)
-                except:
-                    font = ImageFont.load_default()
-
-                draw.text((180, 200), "Camera Feed", fill=(253, 185, 19), font=font)
-                draw.text((140, 240), "Waiting for ROS2...", fill=(200, 200, 200), font=font)
-
-                # Add instructions
-                try:
-                    small_font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 14)
-                except:
-                    small_font = font
-                draw.text((100, 300), "Start ros_gz_bridge and PX4 SITL", fill=(150, 150, 150), font=small_font)
-
-                # Convert to JPEG
-                buffer = io.BytesIO()
-                img.save(buffer, format='JPEG', quality=85)
-                buffer.seek(0)
+            with self.frame_lock:
+                if not self.encode_cond.wait_for(lambda: self._pending is not None, timeout=1.0):
+                    continue
+                frame_id, raw, timestamp, published, unchanged = self._pending
+                self._pending = None
+                listeners = list(self._listeners)
+                if unchanged:
+                    # History and recording skip unchanged frames, so only
+                    # variants that live viewers subscribed to are encoded
+                    listener_variants = Counter(variant for variant, _ in listeners)
+                    variants = [variant for variant, count in self._subscribers.items()
+                                if count > listener_variants[variant]]
+                    listeners = []
+                else:
+                    variants = list(self._subscribers)
 
+            try:
+                encoded = {}
+                for variant in variants:
+                    encoded[variant] = self._get_encoded(frame_id, raw, *variant)
+                self.capture_latency.record(time.monotonic() - published)
+
+                for variant, callback in listeners:
+                    data = encoded.get(variant) or self._get_encoded(frame_id, raw, *variant)
+                    callback(frame_id, timestamp, data)
+            except Exception as e:
+                print(f"Frame encode error: {e}")
+            finally:
                 with self.frame_lock:
-                    self.latest_frame = buffer.getvalue()
+                    self._unpin(raw[0])
 
-                time.sleep(0.2)  # 5 FPS for placeholder
+    def subscribe(self, width=None, quality=None, fmt='jpeg'):
+        """
+        Register a streaming consumer so new frames are pre-encoded for it
 
-            except Exception as e:
-                print(f"Placeholder generation error: {e}")
-                time.sleep(1)
+        Returns: normalized variant to pass back to unsubscribe()
+        """
+        variant = self.normalize_variant(width, quality, fmt)
+        with self.frame_lock:
+            self._subscribers[variant] += 1
+        return variant
+
+    def unsubscribe(self, variant):
+        """Remove a consumer registered with subscribe()"""
+        with self.frame_lock:
+            self._subscribers[variant] -= 1
+            if self._subscribers[variant] <= 0:
+                del self._subscribers[variant]
+
+    def add_listener(self, callback, width=None, quality=None, fmt='jpeg'):
+        """
+        Call callback(frame_id, timestamp, data) from the encoder pool for every
+        frame it encodes (frames dropped by the latest-wins handoff are skipped)
+
+        Returns: handle to pass to remove_listener()
+        """
+        variant = self.subscribe(width, quality, fmt)
+        listener = (variant, callback)
+        with self.frame_lock:
+            self._listeners.append(listener)
+        return listener
+
+    def remove_listener(self, listener):
+        """Remove a listener registered with add_listener()"""
+        with self.frame_lock:
+            self._listeners.remove(listener)
+        self.unsubscribe(listener[0])
+
+    def enable_history(self, max_seconds=30.0, max_bytes=64 * 1024 * 1024, width=None, quality=70):
+        """Keep the last max_seconds of encoded frames (within max_bytes) for seek/replay"""
+        if self.history is None:
+            self.history = FrameHistory(max_seconds, max_bytes)
+            self.add_listener(self.history.append, width, quality)
+        return self.history
+
+    def enable_motion_gate(self, threshold=8.0, max_unchanged=30):
+        """Mark frames that did not change as unchanged (see motion_gate.py and changed_since())"""
+        if self.motion_gate is None:
+            self.motion_gate = MotionGate(threshold, max_unchanged)
+        return self.motion_gate
+
+    def start_recording(self, path, width=None, quality=85, segment_bytes=64 * 1024 * 1024):
+        """Start recording encoded frames to segment files under path"""
+        if self.recorder is not None:
+            raise RuntimeError(f"Already recording to {self.recorder.path}")
+        self.recorder = CameraRecorder(path, segment_bytes)
+        self._recorder_listener = self.add_listener(self.recorder.append, width, quality)
+        print(f"⏺ Recording camera to {path}")
+        return self.recorder
+
+    def stop_recording(self):
+        """Stop the active recording and flush it to disk"""
+        recorder = self.recorder
+        if recorder is None:
+            return None
+        self.remove_listener(self._recorder_listener)
+        self.recorder = None
+        self._recorder_listener = None
+        recorder.stop()
+        print(f"⏹ Recording stopped: {recorder.frames_written} frames")
+        return recorder
+
+    def normalize_variant(self, width=None, quality=None, fmt='jpeg'):
+        """
+        Map requested encoding parameters onto the encoding ladder
+
+        Returns: (width, quality, fmt) where width is None for full size
+        """
+        if fmt not in self.FORMATS:
+            raise ValueError(f"Unsupported format: {fmt}")
+        if width is not None:
+            width = next((rung for rung in self.WIDTH_LADDER if rung >= width), None)
+        quality = self.jpeg_quality if quality is None else max(10, min(95, int(quality)))
+        return width, quality, fmt
+
+    def _get_preprocess(self, frame_id, raw):
+        """Preprocessing cache for frame_id, shared by every consumer of the latest frame"""
+        with self.preprocess_lock:
+            prep = self._preprocess
+            if prep is None or prep.frame_id < frame_id:
+                prep = self._preprocess = FramePreprocess(frame_id, raw, self.preprocess_stats)
+            elif prep.frame_id > frame_id:
+                # A straggler asking for an older frame must not evict the newest one
+                prep = FramePreprocess(frame_id, raw, self.preprocess_stats)
+            return prep
+
+    def _get_image(self, frame_id, raw, width):
+        """Return frame_id as a PIL image, downscaled once per frame and width"""
+        return self._get_preprocess(frame_id, raw).image(width)
+
+    def _get_encoded(self, frame_id, raw, width=None, quality=None, fmt='jpeg'):
+        """Return frame_id encoded for a ladder rung, encoding it at most once"""
+        width, quality, fmt = self.normalize_variant(width, quality, fmt)
+        key = (frame_id, width, quality, fmt)
+
+        with self.cache_lock:
+            frame = self._encode_cache.get(key)
+            if frame is not None:
+                self._encode_cache.move_to_end(key)
+                return frame
+            event = self._inflight.get(key)
+            owner = event is None
+            if owner:
+                event = self._inflight[key] = threading.Event()
+
+        if not owner:
+            # Someone else is encoding this exact variant; share their result
+            event.wait()
+            with self.cache_lock:
+                frame = self._encode_cache.get(key)
+            if frame is not None:
+                return frame
+
+        try:
+            start = time.monotonic()
+            img = self._get_image(frame_id, raw, width)
+            buffer = getattr(self._encode_buffers, 'buffer', None)
+            if buffer is None:
+                buffer = self._encode_buffers.buffer = io.BytesIO()
+            buffer.seek(0)
+            buffer.truncate()
+            img.save(buffer, format=self.FORMATS[fmt][0], quality=quality)
+            frame = buffer.getvalue()
+            self.encode_latency.record(time.monotonic() - start)
+
+            with self.cache_lock:
+                self._encode_cache[key] = frame
+                if len(self._encode_cache) > self.ENCODE_CACHE_SIZE:
+                    self._encode_cache.popitem(last=False)
+            return frame
+        finally:
+            if owner:
+                with self.cache_lock:
+                    del self._inflight[key]
+                event.set()
+
+    def wait_for_frame_id(self, last_id=0, timeout=1.0):
+        """
+        Block until a frame newer than last_id is available, without encoding it
+
+        Returns: the latest frame id (not newer than last_id on timeout)
+        """
+        with self.frame_cond:
+            self.frame_cond.wait_for(lambda: self.frame_id > last_id, timeout)
+            return self.frame_id
+
+    def changed_since(self, frame_id):
+        """Whether a frame newer than frame_id was not marked unchanged by the motion gate"""
+        return self.changed_frame_id > frame_id
+
+    def wait_for_frame(self, last_id=0, timeout=1.0, width=None, quality=None, fmt='jpeg'):
+        """
+        Block until a frame newer than last_id is available
+
+        Always returns the most recent frame, so slow consumers skip
+        intermediate frames instead of falling behind.
+
+        Returns: (frame_id, jpeg_bytes), or (last_id, None) on timeout
+        """
+        with self.frame_cond:
+            if not self.frame_cond.wait_for(lambda: self.frame_id > last_id, timeout):
+                return last_id, None
+            frame_id, raw = self._read_latest()
+        return frame_id, self._encode_pinned(frame_id, raw, width, quality, fmt)
+
+    def get_frame_with_id(self, width=None, quality=None, fmt='jpeg'):
+        """
+        Get latest camera frame as (frame_id, encoded bytes)
+
+        Args:
+            width: target width in pixels, snapped up to WIDTH_LADDER (None = full size)
+            quality: encoder quality 10-95 (None = jpeg_quality)
+            fmt: key of FORMATS
+        """
+        with self.frame_lock:
+            # Falls back to an empty image if no frame is available yet
+            frame_id, raw = self._read_latest()
+        return frame_id, self._encode_pinned(frame_id, raw, width, quality, fmt)
+
+    def get_image(self, width=None):
+        """
+        Get latest camera frame as (frame_id, timestamp, PIL image)
+
+        The image is shared with the encoders (downscaled once per frame and
+        ladder rung) and must be treated as read-only.
+        """
+        width = self.normalize_variant(width)[0]
+        with self.frame_lock:
+            frame_id, raw = self._read_latest()
+            timestamp = self.frame_time
+        try:
+            return frame_id, timestamp, self._get_image(frame_id, raw, width)
+        finally:
+            with self.frame_lock:
+                self._unpin(raw[0])
+
+    def get_gray(self, width=None):
+        """
+        Get latest camera frame as (frame_id, timestamp, grayscale uint8 array)
 
-    def get_frame(self):
-        """Get latest camera frame as JPEG bytes"""
+        Computed once per frame and ladder rung and shared by every vision
+        consumer; the array is read-only.
+        """
+        width = self.normalize_variant(width)[0]
         with self.frame_lock:
-            if self.latest_frame:
-                return self.latest_frame
-            else:
-                # Return empty image if no frame available
-                img = Image.new('RGB', (640, 480), color=(0, 0, 0))
-                buffer = io.BytesIO()
-                img.save(buffer, format='JPEG')
-                buffer.seek(0)
-                return buffer.getvalue()
-
-    def get_frame_base64(self):
-        """Get latest frame as base64-encoded string"""
-        frame = self.get_frame()
+            frame_id, raw = self._read_latest()
+            timestamp = self.frame_time
+        try:
+            return frame_id, timestamp, self._get_preprocess(frame_id, raw).gray(width)
+        finally:
+            with self.frame_lock:
+                self._unpin(raw[0])
+
+    def get_frame(self, width=None, quality=None, fmt='jpeg'):
+        """Get latest camera frame as encoded bytes (JPEG by default)"""
+        return self.get_frame_with_id(width, quality, fmt)[1]
+
+    def get_etag(self, frame_id, width=None, quality=None, fmt='jpeg'):
+        """HTTP entity tag for a frame id and encoding variant"""
+        width, quality, fmt = self.normalize_variant(width, quality, fmt)
+        return f"{self.epoch}-{frame_id}-{width or 'full'}-{quality}-{fmt}"
+
+    def get_frame_base64(self, width=None, quality=None):
+        """Get latest frame as base64-encoded JPEG string"""
+        frame = self.get_frame(width, quality)
         return base64.b64encode(frame).decode('utf-8')
 
+    def get_stats(self):
+        """Get ingest statistics"""
+        with self.frame_lock:
+            rings = list(self._rings.values())
+        return {
+            'name': self.name,
+            'topic': self.topic,
+            'frame_id': self.frame_id,
+            'frames_received': self.frame_count,
+            'frames_dropped': self.frames_dropped,
+            'buffers_allocated': sum(len(ring.buffers) for ring in rings),
+            'buffer_bytes': sum(ring.nbytes for ring in rings),
+            'encode_workers': len(self.encode_workers),
+            'encode_subscribers': sum(self._subscribers.values()),
+            'encode_dropped': self.encode_dropped,
+            'encode_latency': self.encode_latency.to_dict(),
+            'capture_to_encoded_latency': self.capture_latency.to_dict(),
+            'preprocess': dict(self.preprocess_stats),
+            'history': self.history.get_stats() if self.history else None,
+            'recording': self.recorder.get_stats() if self.recorder else None,
+            'motion_gate': self.motion_gate.get_stats() if self.motion_gate else None,
+        }
+
     def stop(self):
         """Stop camera stream"""
         self.running = False
+        with self.frame_cond:
+            self.frame_cond.notify_all()
+            self.encode_cond.notify_all()
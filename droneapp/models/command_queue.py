@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+Vehicle Command Queue
+---------------------
+Single-consumer command queue on the MAVSDK backend event loop. Commands
+run one at a time in submission order; a relative move submitted while
+another relative move is still pending is merged into it, and a full
+queue rejects new commands instead of piling up coroutines.
+
+preempt() is the priority lane for emergencies: it drops everything still
+queued, cancels the running command and starts its own command on the
+next loop iteration, without waiting for the consumer.
+
+Every command gets an id and is timed end to end: received (e.g. HTTP
+receipt, see received_at()), dispatched on the loop, acknowledged (the
+MAVSDK call returned; for offboard moves, the first set_position_ned()
+carrying the new target) and confirmed (the first telemetry sample that
+satisfies the predicate the command returned).
+
+submit() and preempt() return the Command as a handle: callers can wait()
+for the vehicle's acknowledgement, and recent commands stay reachable by
+id through get() for status polling.
+"""
+
+import asyncio
+import itertools
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+
+from droneapp.models.metrics import LatencyHistogram
+
+
+class CommandQueueFull(RuntimeError):
+    """Raised by submit() when max_pending commands are already waiting"""
+
+
+class Command:
+    """
+    One queued vehicle command, and the caller's handle on it
+
+    state: queued -> running -> acknowledged -> confirmed | unconfirmed,
+    or failed / cancelled (preempted while running) / dropped (preempted
+    while queued). wait() returns once the command leaves queued/running.
+    """
+
+    __slots__ = ('id', 'name', 'args', 'run', 'merge', 'merged', 'confirm', 'state', 'error',
+                 'received', 'submitted', 'started', 'finished', 'confirmed', '_done')
+
+    _ids = itertools.count(1)
+
+    def __init__(self, name, run, args, merge, received=None):
+        self.id = next(self._ids)
+        self.name = name
+        self.run = run
+        self.args = args
+        self.merge = merge
+        self.merged = 0
+        self.confirm = None
+        self.state = 'queued'
+        self.error = None
+        self._done = threading.Event()
+        self.submitted = time.monotonic()
+        self.received = self.submitted if received is None else received
+        self.started = None
+        self.finished = None
+        self.confirmed = None
+
+    def _settle(self, state, error=None):
+        self.state = state
+        self.error = error
+        self._done.set()
+
+    @property
+    def done(self):
+        return self._done.is_set()
+
+    def wait(self, timeout=None):
+        """Block until acknowledged, failed, cancelled or dropped; False on timeout"""
+        return self._done.wait(timeout)
+
+    def to_dict(self):
+        """Status for JSON endpoints; latencies in ms from receipt, None until reached"""
+        def since_received(timestamp):
+            return None if timestamp is None else round((timestamp - self.received) * 1000, 3)
+        return {
+            'id': self.id,
+            'command': self.name,
+            'args': list(self.args),
+            'merged': self.merged,
+            'state': self.state,
+            'error': self.error,
+            'dispatch_ms': since_received(self.started),
+            'acknowledged_ms': since_received(self.finished),
+            'confirmed_ms': since_received(self.confirmed),
+        }
+
+
+class CommandQueue:
+    """Ordered, coalescing command queue consumed by one task on `loop`"""
+
+    # Latency per command name: queue_wait (submit -> dispatch) and
+    # execution (dispatch -> ack), then dispatch, acknowledged and
+    # confirmed measured from receipt
+    STAGES = ('queue_wait', 'execution', 'dispatch', 'acknowledged', 'confirmed')
+
+    def __init__(self, loop, max_pending=16, confirm_timeout=10.0, history=256):
+        self.loop = loop
+        self.max_pending = max_pending
+        self.confirm_timeout = confirm_timeout
+        self.history = history
+        # The most recent commands by id, for status polling
+        self._recent = OrderedDict()
+        self._pending = deque()
+        self._lock = threading.Lock()
+        self._wakeup = asyncio.Event()
+        self._local = threading.local()
+        # Acknowledged commands waiting for confirming telemetry (loop thread only)
+        self._confirming = []
+
+        self.commands_run = 0
+        self.commands_merged = 0
+        self.commands_rejected = 0
+        self.commands_dropped = 0
+        self.commands_cancelled = 0
+        self.commands_unconfirmed = 0
+        self._current = None
+        self.latency = {}
+
+        asyncio.run_coroutine_threadsafe(self._consume(), loop)
+
+    def submit(self, name, run, args=(), merge=None):
+        """
+        Queue run(*args) (a coroutine function) from any thread
+
+        merge(pending_args, args) may return combined args to fold this
+        command into an identical command still waiting at the tail.
+
+        Returns: the Command (possibly the pending one it was merged into)
+        """
+        received = getattr(self._local, 'received', None)
+        with self._lock:
+            tail = self._pending[-1] if self._pending else None
+            if merge is not None and tail is not None and tail.name == name:
+                tail.args = merge(tail.args, args)
+                tail.merged += 1
+                self.commands_merged += 1
+                return tail
+
+            if len(self._pending) >= self.max_pending:
+                self.commands_rejected += 1
+                raise CommandQueueFull(f"{len(self._pending)} commands pending")
+            command = Command(name, run, args, merge, received)
+            self._pending.append(command)
+            self._remember(command)
+
+        self.loop.call_soon_threadsafe(self._wakeup.set)
+        return command
+
+    def _remember(self, command):
+        # Called with _lock held
+        self._recent[command.id] = command
+        if len(self._recent) > self.history:
+            self._recent.popitem(last=False)
+
+    def get(self, command_id):
+        """Recent command by id, or None"""
+        with self._lock:
+            return self._recent.get(command_id)
+
+    @contextmanager
+    def received_at(self, timestamp):
+        """Commands this thread submits inside the block count as received at timestamp (time.monotonic())"""
+        self._local.received = timestamp
+        try:
+            yield
+        finally:
+            self._local.received = None
+
+    async def _consume(self):
+        """Run queued commands one at a time, in order"""
+        while True:
+            await self._wakeup.wait()
+            with self._lock:
+                if not self._pending:
+                    self._wakeup.clear()
+                    continue
+                # Taking the command closes it for merging
+                command = self._pending.popleft()
+
+            # Run as its own task so preempt() can cancel it; waiting
+            # rather than awaiting keeps that cancellation out of this loop
+            self._current = task = asyncio.ensure_future(self._execute(command))
+            await asyncio.wait([task])
+            self._current = None
+            if task.cancelled():
+                # Preempted before it got to run
+                self.commands_cancelled += 1
+                command._settle('cancelled')
+                print(f"⚠️ Command {command.name} cancelled")
+
+    def preempt(self, name, run, args=()):
+        """
+        Run run(*args) ahead of all queued work, from any thread
+
+        Pending commands are dropped and the running one is cancelled
+        before the command starts.
+
+        Returns: the Command
+        """
+        command = Command(name, run, args, None, getattr(self._local, 'received', None))
+        with self._lock:
+            self.commands_dropped += len(self._pending)
+            for dropped in self._pending:
+                dropped._settle('dropped')
+            self._pending.clear()
+            self._remember(command)
+        asyncio.run_coroutine_threadsafe(self._preempt(command), self.loop)
+        return command
+
+    async def _preempt(self, command):
+        if self._current is not None:
+            self._current.cancel()
+        await self._execute(command)
+
+    async def _execute(self, command):
+        """Run one command and record its timing"""
+        command.started = time.monotonic()
+        command.state = 'running'
+        result = None
+        outcome = ('acknowledged',)
+        try:
+            result = await command.run(*command.args)
+        except asyncio.CancelledError:
+            self.commands_cancelled += 1
+            outcome = ('cancelled',)
+            print(f"⚠️ Command {command.name} cancelled")
+        except Exception as e:
+            # The command reports its own failure; the handle carries it
+            outcome = ('failed', str(e))
+        command.finished = time.monotonic()
+        command._settle(*outcome)
+        self.commands_run += 1
+
+        self._stats(command.name, 'queue_wait').record(command.started - command.submitted)
+        self._stats(command.name, 'execution').record(command.finished - command.started)
+        self._stats(command.name, 'dispatch').record(command.started - command.received)
+        self._stats(command.name, 'acknowledged').record(command.finished - command.received)
+
+        # A command that succeeded returns a predicate telling which
+        # telemetry sample confirms it took effect
+        if callable(result):
+            command.confirm = result
+            self._confirming.append(command)
+
+    def confirm(self, snapshot):
+        """Check a new telemetry sample against acknowledged commands (loop thread only)"""
+        if not self._confirming:
+            return
+        now = time.monotonic()
+        waiting = []
+        for command in self._confirming:
+            if command.confirm(snapshot):
+                command.confirmed = now
+                command.state = 'confirmed'
+                self._stats(command.name, 'confirmed').record(now - command.received)
+            elif now - command.finished > self.confirm_timeout:
+                command.state = 'unconfirmed'
+                self.commands_unconfirmed += 1
+            else:
+                waiting.append(command)
+        self._confirming = waiting
+
+    def _stats(self, name, stage):
+        if name not in self.latency:
+            self.latency[name] = {stage: LatencyHistogram() for stage in self.STAGES}
+        return self.latency[name][stage]
+
+    def get_stats(self):
+        """Get queue statistics with per-command latency for every stage"""
+        return {
+            'pending': len(self._pending),
+            'max_pending': self.max_pending,
+            'commands_run': self.commands_run,
+            'commands_merged': self.commands_merged,
+            'commands_rejected': self.commands_rejected,
+            'commands_dropped': self.commands_dropped,
+            'commands_cancelled': self.commands_cancelled,
+            'commands_unconfirmed': self.commands_unconfirmed,
+            'awaiting_confirmation': len(self._confirming),
+            'commands': {
+                name: {stage: stats.to_dict() for stage, stats in stages.items()}
+                for name, stages in list(self.latency.items())
+            },
+        }
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Face Detector
+-------------
+Asynchronous Haar-cascade survivor/face detection on a live CameraStream.
+Runs in its own worker on downscaled grayscale frames and never blocks the
+preview stream; results are published per frame id.
+
+Modes:
+  full      run the face cascade on every analysed frame
+  tracking  run the face cascade every `full_every` frames and follow known
+            faces in between with template matching (several times cheaper)
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from droneapp.models.metrics import LatencyStats
+
+MODELS_DIR = os.path.dirname(os.path.abspath(__file__))
+FACE_CASCADE = os.path.join(MODELS_DIR, 'haarcascade_frontalface_default.xml')
+EYE_CASCADE = os.path.join(MODELS_DIR, 'haarcascade_eye.xml')
+
+
+class FaceDetector:
+    """Haar-cascade detection stage attached to one CameraStream"""
+
+    # Detection results kept for lookup by frame id
+    RESULTS_SIZE = 256
+    MAX_STRIDE = 30
+    MODES = ('full', 'tracking')
+    # Template match score below which a tracked face is considered lost
+    TRACK_THRESHOLD = 0.5
+
+    def __init__(self, camera, detect_width=320, target_latency=0.2,
+                 scale_factor=1.2, min_neighbors=5,
+                 mode='full', full_every=10, detect_eyes=False):
+        """
+        Args:
+            camera: CameraStream to analyse
+            detect_width: width of the grayscale frames the cascade runs on
+            target_latency: seconds from capture to result the detector tries to hold
+            mode: 'full' or 'tracking' (see module docstring)
+            full_every: in tracking mode, frames between full cascade passes
+            detect_eyes: run the eye cascade inside each detected/tracked face
+        """
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown detection mode: {mode}")
+        self.camera = camera
+        self.detect_width = detect_width
+        self.target_latency = target_latency
+        self.scale_factor = scale_factor
+        self.min_neighbors = min_neighbors
+        self.mode = mode
+        self.full_every = full_every
+        self.detect_eyes = detect_eyes
+
+        # Faces followed between full passes: [(box, template), ...] in detect pixels
+        self.tracks = []
+        # Start due, so the first frame gets a full pass
+        self.frames_since_full = full_every
+        self.pass_cost = {'full': LatencyStats(), 'track': LatencyStats()}
+
+        # Process one frame out of every `stride`; adapted to the measured latency
+        self.stride = 1
+        self.avg_latency = 0.0
+        self.frames_processed = 0
+        self.frames_skipped = 0
+        self.frames_unchanged = 0
+
+        self.results = OrderedDict()
+        self.latest = None
+        self.results_lock = threading.Lock()
+        self.results_cond = threading.Condition(self.results_lock)
+
+        self.running = False
+        self.available = False
+        try:
+            import cv2
+            self.cv2 = cv2
+            self.face_cascade = cv2.CascadeClassifier(FACE_CASCADE)
+            self.eye_cascade = cv2.CascadeClassifier(EYE_CASCADE)
+            self.available = not self.face_cascade.empty()
+        except ImportError as e:
+            print(f"⚠️ OpenCV not available, face detection disabled: {e}")
+
+        if self.available:
+            self.running = True
+            self.thread = threading.Thread(target=self._detect_loop,
+                                           name=f"{camera.name}-detector", daemon=True)
+            self.thread.start()
+            print(f"🔍 Face detection started on '{camera.name}'")
+
+    def _detect_loop(self):
+        """Worker: run the cascade on the newest frame, skipping frames to hold target latency"""
+        # Keep OpenCV to this thread and yield the CPU to capture/encoding
+        self.cv2.setNumThreads(1)
+        try:
+            os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), 10)
+        except (AttributeError, OSError):
+            pass
+
+        last_id = 0
+        while self.running:
+            frame_id = self.camera.wait_for_frame_id(last_id + self.stride - 1, timeout=1.0)
+            if frame_id <= last_id:
+                continue
+            if last_id and not self.camera.changed_since(last_id):
+                # The motion gate marked every frame since the last pass unchanged
+                self.frames_unchanged += frame_id - last_id
+                last_id = frame_id
+                continue
+
+            try:
+                frame_id, timestamp, gray = self.camera.get_gray(self.detect_width)
+                if frame_id <= last_id:
+                    continue
+                if last_id:
+                    self.frames_skipped += frame_id - last_id - 1
+                last_id = frame_id
+
+                start = time.monotonic()
+                faces, eyes, pass_mode = self.detect(gray)
+                cost = time.monotonic() - start
+                self.pass_cost[pass_mode].record(cost)
+                self._publish(frame_id, timestamp, faces, eyes, pass_mode, cost)
+            except Exception as e:
+                print(f"Face detection error: {e}")
+                time.sleep(1)
+
+    def detect(self, gray):
+        """
+        Detect faces (and optionally eyes) in a grayscale frame
+
+        gray is the camera's shared, read-only grayscale level (see
+        CameraStream.get_gray); the face and eye cascades both run on it.
+
+        Returns: (faces, eyes, pass_mode) with boxes [x, y, w, h] in source
+        pixels; pass_mode is 'full' for a cascade pass or 'track' otherwise
+        """
+        # Between full passes only known faces are followed; with none
+        # tracked the frame has no detections until the next full pass
+        if self.mode == 'full' or self.frames_since_full >= self.full_every:
+            faces = [tuple(int(v) for v in face) for face in
+                     self.face_cascade.detectMultiScale(gray, self.scale_factor, self.min_neighbors)]
+            pass_mode = 'full'
+            self.frames_since_full = 0
+        else:
+            faces = self._track(gray) if self.tracks else []
+            pass_mode = 'track'
+            self.frames_since_full += 1
+
+        if self.mode == 'tracking':
+            self.tracks = [((x, y, w, h), gray[y:y + h, x:x + w].copy()) for x, y, w, h in faces]
+
+        eyes = []
+        if self.detect_eyes and not self.eye_cascade.empty():
+            # Eye checks only run inside face regions, never on the whole frame
+            for x, y, w, h in faces:
+                for ex, ey, ew, eh in self.eye_cascade.detectMultiScale(gray[y:y + h, x:x + w]):
+                    eyes.append((x + ex, y + ey, ew, eh))
+
+        source_width = self.camera.frame_size[0] if self.camera.frame_size else gray.shape[1]
+        scale = source_width / gray.shape[1]
+        return ([[int(round(v * scale)) for v in box] for box in faces],
+                [[int(round(v * scale)) for v in box] for box in eyes],
+                pass_mode)
+
+    def _track(self, gray):
+        """Follow known faces with template matching in a window around their last box"""
+        height, width = gray.shape
+        faces = []
+        for (x, y, w, h), template in self.tracks:
+            margin = max(8, w // 2)
+            x0, y0 = max(0, x - margin), max(0, y - margin)
+            x1, y1 = min(width, x + w + margin), min(height, y + h + margin)
+            window = gray[y0:y1, x0:x1]
+            if window.shape[0] < h or window.shape[1] < w:
+                continue
+
+            scores = self.cv2.matchTemplate(window, template, self.cv2.TM_CCOEFF_NORMED)
+            _, best, _, (bx, by) = self.cv2.minMaxLoc(scores)
+            if best >= self.TRACK_THRESHOLD:
+                faces.append((x0 + bx, y0 + by, w, h))
+        return faces
+
+    def _publish(self, frame_id, timestamp, boxes, eyes, pass_mode, cost):
+        latency = time.time() - timestamp
+        self.avg_latency = latency if not self.frames_processed else 0.8 * self.avg_latency + 0.2 * latency
+        self.frames_processed += 1
+
+        # Adapt the stride: back off when over target, catch up when well under
+        if self.avg_latency > self.target_latency and self.stride < self.MAX_STRIDE:
+            self.stride += 1
+        elif self.avg_latency < self.target_latency / 2 and self.stride > 1:
+            self.stride -= 1
+
+        result = {
+            'frame_id': frame_id,
+            'timestamp': timestamp,
+            'boxes': boxes,
+            'eyes': eyes,
+            'pass': pass_mode,
+            'cost_ms': round(cost * 1000, 2),
+            'latency_ms': round(latency * 1000, 2),
+        }
+        with self.results_cond:
+            self.results[frame_id] = result
+            if len(self.results) > self.RESULTS_SIZE:
+                self.results.popitem(last=False)
+            self.latest = result
+            self.results_cond.notify_all()
+
+    def get_result(self, frame_id=None):
+        """Detection result for frame_id (latest if None), or None if not analysed"""
+        with self.results_lock:
+            if frame_id is None:
+                return self.latest
+            return self.results.get(frame_id)
+
+    def wait_for_result(self, after_id, timeout=10.0):
+        """Block until a result for a frame newer than after_id exists"""
+        with self.results_cond:
+            self.results_cond.wait_for(
+                lambda: self.latest is not None and self.latest['frame_id'] > after_id, timeout)
+            return self.latest
+
+    def get_stats(self):
+        """Get detector statistics"""
+        full_cost = self.pass_cost['full'].to_dict()
+        track_cost = self.pass_cost['track'].to_dict()
+        return {
+            'camera': self.camera.name,
+            'available': self.available,
+            'mode': self.mode,
+            'full_every': self.full_every,
+            'detect_eyes': self.detect_eyes,
+            'tracks': len(self.tracks),
+            'full_pass_cost': full_cost,
+            'track_pass_cost': track_cost,
+            'track_speedup': (round(full_cost['avg_ms'] / track_cost['avg_ms'], 1)
+                              if full_cost['count'] and track_cost['count'] and track_cost['avg_ms'] else None),
+            'detect_width': self.detect_width,
+            'target_latency_ms': self.target_latency * 1000,
+            'avg_latency_ms': round(self.avg_latency * 1000, 2),
+            'stride': self.stride,
+            'frames_processed': self.frames_processed,
+            'frames_skipped': self.frames_skipped,
+            'frames_unchanged': self.frames_unchanged,
+        }
+
+    def stop(self):
+        """Stop the detection worker"""
+        self.running = False
@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""
+Flight Log
+----------
+Append-only binary log of every telemetry update and issued command, and a
+replay source that feeds a log back through the MAVSDK telemetry stream
+interface so the backend monitors run unchanged without a live PX4.
+
+File layout: one HEADER, then fixed-width RECORDs in time order.
+"""
+
+import asyncio
+import os
+import queue
+import struct
+import threading
+import time
+from collections import namedtuple
+from types import SimpleNamespace
+
+from droneapp.models.telemetry import TelemetrySnapshot
+
+MAGIC = b'FLOG'
+VERSION = 2
+# magic, version, record size
+HEADER = struct.Struct('<4sHH')
+
+KIND_TELEMETRY = 0
+KIND_COMMAND = 1
+
+# Snapshot fields stored in every telemetry record
+FLAG_FIELDS = ('connected', 'armed', 'in_air', 'health_ok')
+NUMERIC_FIELDS = ('north', 'east', 'altitude', 'velocity_north', 'velocity_east', 'velocity_down',
+                  'roll', 'pitch', 'yaw', 'battery', 'satellites', 'gps_fix')
+# Integer fields stored as floats
+INT_FIELDS = ('satellites', 'gps_fix')
+# Bit i of a record's mask is set if TelemetrySnapshot.FIELDS[i] changed
+MASK_FIELDS = TelemetrySnapshot.FIELDS
+
+# kind, timestamp, mask, text, flags, values. Telemetry records: mask of
+# changed fields, flight mode, snapshot values. Command records: argument
+# count, command name, arguments in the first values
+RECORD = struct.Struct(f'<BdI16s{len(FLAG_FIELDS)}B{len(NUMERIC_FIELDS)}f')
+
+TelemetryRecord = namedtuple('TelemetryRecord', ['timestamp', 'changed', 'values'])
+CommandRecord = namedtuple('CommandRecord', ['timestamp', 'command', 'args'])
+
+
+class FlightLogWriter:
+    """Log writer; callers only enqueue, a background thread writes in batches"""
+
+    def __init__(self, path, queue_size=4096, batch_size=256):
+        self.path = path
+        self.batch_size = batch_size
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+        # A full queue drops records instead of blocking the event loop
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.records_written = 0
+        self.records_dropped = 0
+        self.running = True
+
+        self._file = open(path, 'ab')
+        if self._file.tell() == 0:
+            self._file.write(HEADER.pack(MAGIC, VERSION, RECORD.size))
+
+        self.thread = threading.Thread(target=self._write_loop, name="flight-log", daemon=True)
+        self.thread.start()
+        print(f"📝 Flight log: {path}")
+
+    def log_telemetry(self, snapshot, changed):
+        """Queue a telemetry snapshot; changed is the names of the fields that changed"""
+        mask = 0
+        for i, name in enumerate(MASK_FIELDS):
+            if name in changed:
+                mask |= 1 << i
+        self._put(RECORD.pack(KIND_TELEMETRY, snapshot.timestamp, mask,
+                              snapshot.flight_mode.encode()[:16],
+                              *(getattr(snapshot, name) for name in FLAG_FIELDS),
+                              *(getattr(snapshot, name) for name in NUMERIC_FIELDS)))
+
+    def log_command(self, command, *args):
+        """Queue an issued command with up to len(NUMERIC_FIELDS) numeric arguments"""
+        values = [float(arg) for arg in args[:len(NUMERIC_FIELDS)]]
+        values += [0.0] * (len(NUMERIC_FIELDS) - len(values))
+        self._put(RECORD.pack(KIND_COMMAND, time.time(), len(args), command.encode()[:16],
+                              *([0] * len(FLAG_FIELDS)), *values))
+
+    def _put(self, record):
+        if not self.running:
+            return
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.records_dropped += 1
+
+    def _write_loop(self):
+        """Writer thread: one write per batch of queued records"""
+        while self.running or not self.queue.empty():
+            try:
+                batch = [self.queue.get(timeout=0.5)]
+            except queue.Empty:
+                continue
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                self._file.write(b''.join(batch))
+                self._file.flush()
+                self.records_written += len(batch)
+            except Exception as e:
+                print(f"Flight log write error: {e}")
+
+        self._file.close()
+
+    def stop(self):
+        """Flush queued records and close the log"""
+        self.running = False
+        self.thread.join(timeout=5)
+
+    def get_stats(self):
+        """Get writer statistics"""
+        return {
+            'path': self.path,
+            'logging': self.running,
+            'records_written': self.records_written,
+            'records_dropped': self.records_dropped,
+            'queued': self.queue.qsize(),
+        }
+
+
+def prune_flight_logs(directory, keep):
+    """Delete all but the newest `keep` .flog files in directory; returns how many were removed"""
+    if not os.path.isdir(directory):
+        return 0
+    logs = sorted((os.path.join(directory, name) for name in os.listdir(directory)
+                   if name.endswith('.flog')), key=os.path.getmtime)
+    removed = 0
+    for path in logs[:max(len(logs) - keep, 0)]:
+        try:
+            os.remove(path)
+            removed += 1
+        except OSError as e:
+            print(f"⚠️ Could not remove old flight log {path}: {e}")
+    return removed
+
+
+def read_flight_log(path):
+    """Yield TelemetryRecord and CommandRecord entries of a log in order"""
+    with open(path, 'rb') as f:
+        data = f.read()
+    if len(data) < HEADER.size:
+        return
+    magic, version, record_size = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION or record_size != RECORD.size:
+        raise ValueError(f"Not a version {VERSION} flight log: {path}")
+
+    # Ignore a partially written last record
+    end = HEADER.size + (len(data) - HEADER.size) // RECORD.size * RECORD.size
+    for kind, timestamp, mask, text, *rest in RECORD.iter_unpack(memoryview(data)[HEADER.size:end]):
+        text = text.rstrip(b'\0').decode()
+        if kind == KIND_COMMAND:
+            yield CommandRecord(timestamp, text, tuple(rest[len(FLAG_FIELDS):][:mask]))
+            continue
+        values = dict(zip(FLAG_FIELDS, map(bool, rest)))
+        values.update(zip(NUMERIC_FIELDS, rest[len(FLAG_FIELDS):]))
+        for name in INT_FIELDS:
+            values[name] = int(values[name])
+        values['flight_mode'] = text
+        changed = {name for i, name in enumerate(MASK_FIELDS) if mask & (1 << i)}
+        yield TelemetryRecord(timestamp, changed, values)
+
+
+class ReplayTelemetry:
+    """
+    Stand-in for mavsdk's System.telemetry that plays back a flight log
+
+    Each stream method returns an async iterator yielding the same shapes
+    as MAVSDK, so the backend monitors consume a replay exactly as they
+    consume a live vehicle. speed=1.0 keeps the recorded timing; speed=0
+    plays as fast as the monitors keep up.
+    """
+
+    # stream -> snapshot fields that trigger it
+    STREAMS = {
+        'position_velocity_ned': ('north', 'east', 'altitude',
+                                  'velocity_north', 'velocity_east', 'velocity_down'),
+        'armed': ('armed',),
+        'in_air': ('in_air',),
+        'flight_mode': ('flight_mode',),
+        'battery': ('battery',),
+        'attitude_euler': ('roll', 'pitch', 'yaw'),
+        'gps_info': ('satellites', 'gps_fix'),
+        'health': ('health_ok',),
+    }
+    QUEUE_SIZE = 256
+
+    def __init__(self, path, speed=1.0, on_command=None):
+        self.path = path
+        self.speed = speed
+        self.on_command = on_command
+        self._queues = {name: [] for name in self.STREAMS}
+        self.records_played = 0
+        self.finished = False
+
+    def _stream(self, name):
+        # Subscribe now rather than on first iteration so no event is missed
+        events = asyncio.Queue(self.QUEUE_SIZE)
+        self._queues[name].append(events)
+        return self._drain(events)
+
+    @staticmethod
+    async def _drain(events):
+        while True:
+            event = await events.get()
+            if event is None:
+                return
+            yield event
+
+    def position_velocity_ned(self):
+        return self._stream('position_velocity_ned')
+
+    def armed(self):
+        return self._stream('armed')
+
+    def in_air(self):
+        return self._stream('in_air')
+
+    def flight_mode(self):
+        return self._stream('flight_mode')
+
+    def battery(self):
+        return self._stream('battery')
+
+    def attitude_euler(self):
+        return self._stream('attitude_euler')
+
+    def gps_info(self):
+        return self._stream('gps_info')
+
+    def health(self):
+        return self._stream('health')
+
+    @staticmethod
+    def _event(name, v):
+        """Build a MAVSDK-shaped event for a stream from record values"""
+        if name == 'position_velocity_ned':
+            return SimpleNamespace(
+                position=SimpleNamespace(north_m=v['north'], east_m=v['east'], down_m=-v['altitude']),
+                velocity=SimpleNamespace(north_m_s=v['velocity_north'], east_m_s=v['velocity_east'],
+                                         down_m_s=v['velocity_down']))
+        if name == 'battery':
+            return SimpleNamespace(remaining_percent=v['battery'] / 100)
+        if name == 'attitude_euler':
+            return SimpleNamespace(roll_deg=v['roll'], pitch_deg=v['pitch'], yaw_deg=v['yaw'])
+        if name == 'gps_info':
+            return SimpleNamespace(num_satellites=v['satellites'], fix_type=v['gps_fix'])
+        if name == 'health':
+            ok = v['health_ok']
+            return SimpleNamespace(is_global_position_ok=ok, is_local_position_ok=ok,
+                                   is_home_position_ok=ok)
+        return v[name]
+
+    async def run(self):
+        """Play the log into every subscribed stream, then end the streams"""
+        # Give the monitors a moment to subscribe to their streams
+        for _ in range(100):
+            if all(self._queues.values()):
+                break
+            await asyncio.sleep(0.01)
+
+        start = first = None
+        try:
+            for record in read_flight_log(self.path):
+                if first is None:
+                    start, first = time.monotonic(), record.timestamp
+                if self.speed > 0:
+                    delay = (record.timestamp - first) / self.speed - (time.monotonic() - start)
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+
+                if isinstance(record, CommandRecord):
+                    if self.on_command is not None:
+                        self.on_command(record)
+                else:
+                    for name, fields in self.STREAMS.items():
+                        if record.changed.intersection(fields):
+                            event = self._event(name, record.values)
+                            for events in self._queues[name]:
+                                await events.put(event)
+                self.records_played += 1
+                if self.speed <= 0 and self.records_played % 64 == 0:
+                    await asyncio.sleep(0)
+        finally:
+            self.finished = True
+            for subscribers in self._queues.values():
+                for events in subscribers:
+                    await events.put(None)
+            print(f"⏹ Replay finished: {self.records_played} records from {self.path}")
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Camera Frame History
+--------------------
+Bounded in-memory history of encoded camera frames for seek/replay
+"""
+
+import bisect
+import threading
+from collections import namedtuple
+
+
+HistoryFrame = namedtuple('HistoryFrame', ['frame_id', 'timestamp', 'data'])
+
+
+class FrameHistory:
+    """
+    Ring buffer of the last N seconds of encoded frames, capped by a byte budget
+
+    The writer publishes an immutable tuple of frames on every append, so
+    readers take a snapshot with a single attribute read and never touch
+    the writer lock. Frames are ordered by both frame_id and timestamp.
+    """
+
+    def __init__(self, max_seconds=30.0, max_bytes=64 * 1024 * 1024):
+        self.max_seconds = max_seconds
+        self.max_bytes = max_bytes
+        self._frames = ()
+        self._bytes = 0
+        self._write_lock = threading.Lock()
+
+    def append(self, frame_id, timestamp, data):
+        """Add an encoded frame, evicting the oldest frames beyond the budget"""
+        with self._write_lock:
+            frames = self._frames
+            if frames and frame_id <= frames[-1].frame_id:
+                return
+
+            frames = frames + (HistoryFrame(frame_id, timestamp, data),)
+            total = self._bytes + len(data)
+
+            start = 0
+            oldest_allowed = timestamp - self.max_seconds
+            while start < len(frames) - 1 and (total > self.max_bytes or
+                                               frames[start].timestamp < oldest_allowed):
+                total -= len(frames[start].data)
+                start += 1
+
+            self._bytes = total
+            self._frames = frames[start:]
+
+    def list_frames(self, start=None, end=None):
+        """
+        List frames with start <= timestamp <= end
+
+        Returns: [(frame_id, timestamp, size_bytes), ...] oldest first
+        """
+        frames = self._frames
+        lo = 0 if start is None else bisect.bisect_left(frames, start, key=lambda f: f.timestamp)
+        hi = len(frames) if end is None else bisect.bisect_right(frames, end, key=lambda f: f.timestamp)
+        return [(f.frame_id, f.timestamp, len(f.data)) for f in frames[lo:hi]]
+
+    def get_frame(self, frame_id):
+        """Get a HistoryFrame by id, or None if it is not (or no longer) stored"""
+        frames = self._frames
+        i = bisect.bisect_left(frames, frame_id, key=lambda f: f.frame_id)
+        if i < len(frames) and frames[i].frame_id == frame_id:
+            return frames[i]
+        return None
+
+    def get_stats(self):
+        """Get history size statistics"""
+        frames = self._frames
+        return {
+            'frames': len(frames),
+            'bytes': sum(len(f.data) for f in frames),
+            'max_bytes': self.max_bytes,
+            'max_seconds': self.max_seconds,
+            'oldest': frames[0].timestamp if frames else None,
+            'newest': frames[-1].timestamp if frames else None,
+        }
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Frame Preprocessing Cache
+-------------------------
+Per-frame images shared by every consumer of a CameraStream: the RGB view,
+downscaled pyramid levels and their grayscale versions. Each is computed
+lazily, at most once per frame id, and must be treated as read-only.
+"""
+
+import threading
+
+import numpy as np
+from PIL import Image
+
+
+class FramePreprocess:
+    """Lazily computed views of one raw (array, PIL raw mode) frame"""
+
+    def __init__(self, frame_id, raw, stats=None):
+        self.frame_id = frame_id
+        self.raw = raw
+        self.lock = threading.Lock()
+        self._images = {}
+        self._gray = {}
+        # Shared counters: {'image': n, 'gray': n, 'hits': n}
+        self.stats = stats if stats is not None else {'image': 0, 'gray': 0, 'hits': 0}
+
+    def image(self, width=None):
+        """
+        PIL image at width (None = full size); RGB, or L for mono cameras
+
+        Must be called while the raw buffer is pinned (see CameraStream._read_latest)
+        """
+        with self.lock:
+            return self._image_locked(width)
+
+    def _image_locked(self, width):
+        img = self._images.get(width)
+        if img is not None:
+            self.stats['hits'] += 1
+            return img
+
+        if width is None:
+            img_array, raw_mode = self.raw
+            height, width_px = img_array.shape[:2]
+            mode = 'L' if raw_mode == 'L' else 'RGB'
+            # The raw decoder reorders/strips channels while copying into PIL,
+            # so the image never aliases a ring buffer that may be reused
+            img = Image.frombytes(mode, (width_px, height), img_array, 'raw', raw_mode)
+        else:
+            # Pyramid: downscale from the smallest level already built above width
+            larger = [w for w in self._images if w is not None and w > width]
+            img = self._images[min(larger)] if larger else self._image_locked(None)
+            if width < img.width:
+                height = max(1, round(img.height * width / img.width))
+                img = img.resize((width, height), Image.BILINEAR)
+
+        self.stats['image'] += 1
+        self._images[width] = img
+        return img
+
+    def gray(self, width=None):
+        """Read-only uint8 grayscale array at width (None = full size)"""
+        with self.lock:
+            gray = self._gray.get(width)
+            if gray is not None:
+                self.stats['hits'] += 1
+                return gray
+
+            img = self._image_locked(width)
+            gray = np.array(img if img.mode == 'L' else img.convert('L'))
+            gray.setflags(write=False)
+            self.stats['gray'] += 1
+            self._gray[width] = gray
+            return gray
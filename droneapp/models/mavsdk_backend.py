@@ -6,12 +6,19 @@ Bridges synchronous Flask with asynchronous MAVSDK
 """
 
 import asyncio
+import json
+import math
 import threading
 import time
 from typing import Optional
 from mavsdk import System
 from mavsdk.offboard import OffboardError, PositionNedYaw
 
+from droneapp.models.command_queue import CommandQueue
+from droneapp.models.flight_log import FlightLogWriter, ReplayTelemetry
+from droneapp.models.telemetry import TelemetrySnapshot
+from droneapp.models.telemetry_buffer import TelemetryBuffer
+
 
 class MAVSDKDroneBackend:
     """Singleton MAVSDK drone backend for Flask"""
@@ -19,35 +26,94 @@ class MAVSDKDroneBackend:
     _instance = None
     _lock = threading.Lock()
 
+    # Telemetry samples kept for history queries. Every monitor update adds
+    # a row, ~66 rows/s at the default TELEMETRY_RATES: ~2 h, ~24 MB
+    TELEMETRY_HISTORY_ROWS = 500000
+
+    # Commands allowed to wait in the command queue before new ones are rejected
+    COMMAND_QUEUE_SIZE = 16
+
+    # A command counts as confirmed by the first telemetry sample showing
+    # its effect (a move: this much closer to its target), if within the timeout
+    CONFIRM_DISTANCE_M = 0.1
+    CONFIRM_YAW_DEG = 2.0
+    CONFIRM_HOLD_SPEED = 0.2  # m/s
+    CONFIRM_TIMEOUT = 10.0
+
+    # Offboard setpoints are re-sent at this rate while a target is set
+    # (PX4 leaves offboard mode if setpoints arrive at less than 2 Hz)
+    SETPOINT_RATE_HZ = 20.0
+    # A command that replaced the target fails if the stream has not sent it by then
+    SETPOINT_SEND_TIMEOUT = 1.0
+
+    # Requested stream rates in Hz (mavsdk telemetry.set_rate_<stream>):
+    # fast for what the operator and 3D view follow, slow for the rest.
+    # flight_mode has no rate setting; it follows the 1 Hz heartbeat.
+    TELEMETRY_RATES = {
+        'position_velocity_ned': 30.0,
+        'attitude_euler': 30.0,
+        'in_air': 2.0,
+        'gps_info': 1.0,
+        'battery': 1.0,
+        'health': 1.0,
+    }
+
     @classmethod
-    def get_instance(cls):
+    def get_instance(cls, replay_path=None, replay_speed=1.0, telemetry_rates=None):
+        """
+        Get the backend, creating it on first use
+
+        Args:
+            replay_path: play this flight log instead of connecting to PX4
+            replay_speed: 1.0 = recorded timing, 0 = as fast as possible
+            telemetry_rates: overrides for TELEMETRY_RATES
+        """
         if cls._instance is None:
             with cls._lock:
                 if cls._instance is None:
-                    cls._instance = cls()
+                    cls._instance = cls(replay_path, replay_speed, telemetry_rates)
         return cls._instance
 
-    def __init__(self):
+    def __init__(self, replay_path=None, replay_speed=1.0, telemetry_rates=None):
         self.drone = System()
         self.loop = None
         self.thread = None
-        self.connected = False
-        self.armed = False
-        self.in_air = False
         self.offboard_active = False
-
-        # Telemetry data
-        self.position_north = 0.0
-        self.position_east = 0.0
-        self.altitude = 0.0
-        self.battery = 100.0
-        self.flight_mode = "IDLE"
+        # Offboard target (north, east, down, yaw) streamed by _setpoint_loop;
+        # commands replace it and wait for the next tick to send it
+        self.setpoint = None
+        self._setpoint_waiters = []
+        self._offboard_lock = asyncio.Lock()
+        self.telemetry_rates = dict(self.TELEMETRY_RATES, **(telemetry_rates or {}))
+
+        # Telemetry: an immutable snapshot replaced (never mutated) on every
+        # update, so readers get a consistent sample without locking. The
+        # condition wakes push-stream readers; the JSON payload is built once per seq
+        self.telemetry = TelemetrySnapshot()
+        self.telemetry_history = TelemetryBuffer(self.TELEMETRY_HISTORY_ROWS)
+        self.telemetry_cond = threading.Condition()
+        self._telemetry_json = (None, None)
+
+        # Optional binary log of telemetry and commands (see flight_log.py)
+        self.flight_log = None
+        self.replay = None
 
         # Start background thread
         self._start_background_loop()
 
-        # Connect to drone
-        self._run_async(self._connect())
+        # Vehicle commands run one at a time, in order, from this queue
+        self.commands = CommandQueue(self.loop, self.COMMAND_QUEUE_SIZE, self.CONFIRM_TIMEOUT)
+
+        # The setpoint stream runs for the backend's lifetime, whether or
+        # not a vehicle is connected, so commands waiting on it never hang
+        self._run_async(self._setpoint_loop())
+
+        # Connect to drone, or feed the monitors from a recorded flight
+        if replay_path:
+            self.replay = ReplayTelemetry(replay_path, replay_speed, self._on_replay_command)
+            self._run_async(self._start_replay())
+        else:
+            self._run_async(self._connect())
 
     def _start_background_loop(self):
         """Start asyncio event loop in background thread"""
@@ -72,55 +138,210 @@ class MAVSDKDroneBackend:
             # Wait for connection
             async for state in self.drone.core.connection_state():
                 if state.is_connected:
-                    self.connected = True
+                    self._update_telemetry(connected=True)
                     print("✅ MAVSDK Backend connected to PX4")
                     break
 
             # Start telemetry monitoring
-            asyncio.ensure_future(self._monitor_telemetry(), loop=self.loop)
+            await self._set_telemetry_rates()
+            asyncio.ensure_future(self._monitor_telemetry(self.drone.telemetry), loop=self.loop)
 
         except Exception as e:
             print(f"✗ Connection failed: {e}")
 
-    async def _monitor_telemetry(self):
-        """Monitor telemetry data continuously"""
+    async def _setpoint_loop(self):
+        """Stream the current offboard target at SETPOINT_RATE_HZ for as long as one is set"""
+        period = 1.0 / self.SETPOINT_RATE_HZ
+        next_tick = self.loop.time()
+        while True:
+            setpoint = self.setpoint
+            # Commands that set a target before this read are answered by this send
+            waiters, self._setpoint_waiters = self._setpoint_waiters, []
+            error = None
+            if setpoint is not None:
+                try:
+                    await self.drone.offboard.set_position_ned(PositionNedYaw(*setpoint))
+                except Exception as e:
+                    print(f"✗ Setpoint stream error: {e}")
+                    error = e
+            else:
+                # Cleared by an emergency stop or by leaving offboard mode
+                error = RuntimeError("Offboard target cleared before it was sent")
+            for waiter in waiters:
+                if waiter.done():
+                    continue
+                if error is None:
+                    waiter.set_result(None)
+                else:
+                    waiter.set_exception(error)
+
+            next_tick = max(next_tick + period, self.loop.time())
+            await asyncio.sleep(next_tick - self.loop.time())
+
+    async def _set_target(self, north, east, down, yaw):
+        """
+        Replace the offboard target, entering offboard mode first if needed
+
+        Returns once MAVSDK has accepted a set_position_ned() carrying the
+        new target, so the command's acknowledgement is the vehicle's
+        """
+        self.setpoint = (north, east, down, yaw)
+        if self.offboard_active:
+            sent = self.loop.create_future()
+            self._setpoint_waiters.append(sent)
+            try:
+                await asyncio.wait_for(sent, self.SETPOINT_SEND_TIMEOUT)
+            except asyncio.TimeoutError:
+                raise RuntimeError(f"Setpoint not sent within {self.SETPOINT_SEND_TIMEOUT:g} s") from None
+            return
+
+        # One coroutine starts offboard; concurrent commands wait for it
+        async with self._offboard_lock:
+            if self.offboard_active:
+                return
+            try:
+                # PX4 requires a setpoint before offboard can start; the
+                # streamer keeps them coming from here on
+                await self.drone.offboard.set_position_ned(PositionNedYaw(*self.setpoint))
+                await self.drone.offboard.start()
+            except BaseException:
+                # Including cancellation by an emergency stop
+                self.setpoint = None
+                raise
+            self.offboard_active = True
+            print("✅ Offboard mode active")
+
+    def _approaching(self, north, east, down, yaw):
+        """Confirmation predicate for a new target: the vehicle got measurably closer to it"""
+        def error(t):
+            distance = math.dist((t.north, t.east, -t.altitude), (north, east, down))
+            return distance, abs((t.yaw - yaw + 180) % 360 - 180)
+
+        start_distance, start_yaw = error(self.telemetry)
+
+        def confirm(t):
+            distance, yaw_error = error(t)
+            return (distance <= start_distance - self.CONFIRM_DISTANCE_M
+                    or yaw_error <= start_yaw - self.CONFIRM_YAW_DEG
+                    or (distance <= self.CONFIRM_DISTANCE_M and yaw_error <= self.CONFIRM_YAW_DEG))
+        return confirm
+
+    async def _set_telemetry_rates(self):
+        """Ask PX4 for each telemetry stream at its configured rate"""
+        for stream, rate_hz in self.telemetry_rates.items():
+            try:
+                await getattr(self.drone.telemetry, f"set_rate_{stream}")(rate_hz)
+            except Exception as e:
+                # Not every stream rate can be set on every autopilot/SITL
+                print(f"⚠️ Could not set {stream} rate to {rate_hz} Hz: {e}")
+
+    async def _start_replay(self):
+        """Run the monitors on a flight log instead of a live vehicle"""
+        speed = f"{self.replay.speed:g}x" if self.replay.speed > 0 else "max speed"
+        print(f"▶ Replaying flight log {self.replay.path} at {speed}")
+        self._update_telemetry(connected=True)
+        asyncio.ensure_future(self._monitor_telemetry(self.replay), loop=self.loop)
+        await self.replay.run()
+
+    def _on_replay_command(self, record):
+        args = ', '.join(f"{arg:g}" for arg in record.args)
+        print(f"▶ [replay] command {record.command}({args})")
+
+    def start_flight_log(self, path):
+        """Log every telemetry update and command to path"""
+        if self.flight_log is None:
+            self.flight_log = FlightLogWriter(path)
+        return self.flight_log
+
+    def stop_flight_log(self):
+        """Flush and close the flight log"""
+        flight_log, self.flight_log = self.flight_log, None
+        if flight_log is not None:
+            flight_log.stop()
+        return flight_log
+
+    def _log_command(self, command, *args):
+        if self.flight_log is not None:
+            self.flight_log.log_command(command, *args)
+
+    def _update_telemetry(self, **changes):
+        """Publish a new telemetry snapshot (called from the event loop thread only)"""
+        with self.telemetry_cond:
+            self.telemetry = self.telemetry.replace(**changes)
+            self.telemetry_history.append(self.telemetry)
+            if self.flight_log is not None:
+                self.flight_log.log_telemetry(self.telemetry, changes)
+            self.telemetry_cond.notify_all()
+        self.commands.confirm(self.telemetry)
+
+    async def _monitor_telemetry(self, source):
+        """
+        Monitor telemetry data continuously
+
+        source is the vehicle's mavsdk telemetry plugin or a ReplayTelemetry
+        """
         try:
             # Monitor position
             async def monitor_position():
-                async for pos_ned in self.drone.telemetry.position_velocity_ned():
-                    self.position_north = pos_ned.position.north_m
-                    self.position_east = pos_ned.position.east_m
-                    self.altitude = abs(pos_ned.position.down_m)
+                async for pos_ned in source.position_velocity_ned():
+                    self._update_telemetry(north=pos_ned.position.north_m,
+                                           east=pos_ned.position.east_m,
+                                           altitude=abs(pos_ned.position.down_m),
+                                           velocity_north=pos_ned.velocity.north_m_s,
+                                           velocity_east=pos_ned.velocity.east_m_s,
+                                           velocity_down=pos_ned.velocity.down_m_s)
 
             # Monitor armed status
             async def monitor_armed():
-                async for armed in self.drone.telemetry.armed():
-                    self.armed = armed
+                async for armed in source.armed():
+                    self._update_telemetry(armed=armed)
 
             # Monitor in_air status
             async def monitor_in_air():
-                async for in_air in self.drone.telemetry.in_air():
-                    self.in_air = in_air
+                async for in_air in source.in_air():
+                    self._update_telemetry(in_air=in_air)
 
             # Monitor flight mode
             async def monitor_flight_mode():
-                async for flight_mode in self.drone.telemetry.flight_mode():
+                async for flight_mode in source.flight_mode():
                     flight_mode_str = str(flight_mode).replace("FlightMode.", "")
-                    self.flight_mode = flight_mode_str
 
-                    # Update offboard_active flag based on actual flight mode
-                    if "OFFBOARD" in flight_mode_str:
+                    # Update offboard_active flag based on actual flight mode;
+                    # a replayed flight mode says nothing about this vehicle
+                    live = source is not self.replay
+                    if live and "OFFBOARD" in flight_mode_str:
                         self.offboard_active = True
-                    else:
-                        # If flight mode changed away from OFFBOARD, update flag
-                        if self.offboard_active and "OFFBOARD" not in flight_mode_str:
-                            self.offboard_active = False
-                            print(f"⚠️ Offboard mode deactivated (flight mode changed to {flight_mode_str})")
+                    elif live and self.offboard_active:
+                        # Flight mode changed away from OFFBOARD
+                        self.offboard_active = False
+                        self.setpoint = None
+                        print(f"⚠️ Offboard mode deactivated (flight mode changed to {flight_mode_str})")
+                    self._update_telemetry(flight_mode=flight_mode_str)
 
             # Monitor battery
             async def monitor_battery():
-                async for battery in self.drone.telemetry.battery():
-                    self.battery = battery.remaining_percent * 100
+                async for battery in source.battery():
+                    self._update_telemetry(battery=battery.remaining_percent * 100)
+
+            # Monitor attitude
+            async def monitor_attitude():
+                async for attitude in source.attitude_euler():
+                    self._update_telemetry(roll=attitude.roll_deg,
+                                           pitch=attitude.pitch_deg,
+                                           yaw=attitude.yaw_deg)
+
+            # Monitor GPS
+            async def monitor_gps():
+                async for gps in source.gps_info():
+                    self._update_telemetry(satellites=gps.num_satellites,
+                                           gps_fix=int(getattr(gps.fix_type, 'value', gps.fix_type)))
+
+            # Monitor health (position estimates usable for offboard/navigation)
+            async def monitor_health():
+                async for health in source.health():
+                    self._update_telemetry(health_ok=bool(health.is_global_position_ok and
+                                                          health.is_local_position_ok and
+                                                          health.is_home_position_ok))
 
             # Run all monitors concurrently
             await asyncio.gather(
@@ -128,7 +349,10 @@ class MAVSDKDroneBackend:
                 monitor_armed(),
                 monitor_in_air(),
                 monitor_flight_mode(),
-                monitor_battery()
+                monitor_battery(),
+                monitor_attitude(),
+                monitor_gps(),
+                monitor_health()
             )
 
         except Exception as e:
@@ -138,21 +362,26 @@ class MAVSDKDroneBackend:
 
     def arm(self):
         """Arm the drone"""
+        self._log_command('arm')
         async def _arm():
             try:
                 await self.drone.action.arm()
                 print("✅ Armed")
+                return lambda t: t.armed
             except Exception as e:
                 print(f"✗ Arm failed: {e}")
+                raise
 
-        self._run_async(_arm())
+        return self.commands.submit('arm', _arm)
 
     def takeoff(self, altitude=2.0):
         """Takeoff to specified altitude"""
+        self._log_command('takeoff', altitude)
         async def _takeoff():
             try:
                 # Stop offboard mode if active (prevents conflict with takeoff mode)
                 if self.offboard_active:
+                    self.setpoint = None
                     await self.drone.offboard.stop()
                     self.offboard_active = False
                     print("⚠️ Stopping offboard mode before takeoff")
@@ -167,188 +396,266 @@ class MAVSDKDroneBackend:
                 await self.drone.action.set_takeoff_altitude(altitude)
                 await self.drone.action.takeoff()
                 print(f"✅ Taking off to {altitude}m")
+                return lambda t: t.in_air
             except Exception as e:
                 print(f"✗ Takeoff failed: {e}")
+                raise
 
-        self._run_async(_takeoff())
+        return self.commands.submit('takeoff', _takeoff)
 
     def land(self):
         """Land the drone"""
+        self._log_command('land')
         async def _land():
             try:
                 # Stop offboard if active
                 if self.offboard_active:
+                    self.setpoint = None
                     await self.drone.offboard.stop()
                     self.offboard_active = False
 
                 await self.drone.action.land()
                 print("✅ Landing")
+                return lambda t: t.flight_mode == 'LAND'
             except Exception as e:
                 print(f"✗ Land failed: {e}")
+                raise
 
-        self._run_async(_land())
+        return self.commands.submit('land', _land)
 
     def goto_position(self, north, east, altitude):
         """Navigate to position using offboard mode"""
+        self._log_command('goto_position', north, east, altitude)
         async def _goto():
             try:
-                # Engage offboard if not active
-                if not self.offboard_active:
-                    # Get current position
-                    pos_ned = await self.drone.telemetry.position_velocity_ned().__anext__()
-                    current_north = pos_ned.position.north_m
-                    current_east = pos_ned.position.east_m
-                    current_down = pos_ned.position.down_m
-
-                    # Send setpoints before starting offboard
-                    for _ in range(10):
-                        await self.drone.offboard.set_position_ned(
-                            PositionNedYaw(current_north, current_east, current_down, 0)
-                        )
-                        await asyncio.sleep(0.2)
-
-                    # Start offboard
-                    await self.drone.offboard.start()
-                    self.offboard_active = True
-                    print("✅ Offboard mode active")
-
-                # Send position command
-                target_down = -abs(altitude)
-                await self.drone.offboard.set_position_ned(
-                    PositionNedYaw(north, east, target_down, 0)
-                )
+                yaw = self.setpoint[3] if self.setpoint else self.telemetry.yaw
+                await self._set_target(north, east, -abs(altitude), yaw)
                 print(f"✅ Navigating to N={north}, E={east}, Alt={altitude}m")
+                return self._approaching(north, east, -abs(altitude), yaw)
 
             except Exception as e:
                 print(f"✗ Goto position failed: {e}")
+                raise
+
+        return self.commands.submit('goto_position', _goto)
 
-        self._run_async(_goto())
+    def emergency_stop(self, land=False):
+        """
+        Emergency stop - kill motors, or land when land=True
 
-    def emergency_stop(self):
-        """Emergency stop - kill motors"""
+        Runs ahead of everything else: queued commands are dropped, the
+        running one is cancelled and setpoint streaming stops.
+        """
+        name = 'emergency_land' if land else 'emergency_stop'
+        self._log_command(name)
         async def _emergency():
+            # Nothing may keep driving the vehicle; the next move re-enters offboard
+            self.setpoint = None
+            self.offboard_active = False
             try:
-                await self.drone.action.kill()
-                print("⚠️ EMERGENCY STOP")
+                if land:
+                    await self.drone.action.land()
+                    print("⚠️ EMERGENCY LAND")
+                    return lambda t: t.flight_mode == 'LAND'
+                else:
+                    await self.drone.action.kill()
+                    print("⚠️ EMERGENCY STOP")
+                    return lambda t: not t.armed
             except Exception as e:
                 print(f"✗ Emergency stop failed: {e}")
+                raise
 
-        self._run_async(_emergency())
+        return self.commands.preempt(name, _emergency)
 
     def move_relative(self, north=0.0, east=0.0, down=0.0, yaw=0.0):
-        """Move relative to current position"""
-        async def _move():
+        """Move relative to the current target (or position, when not in offboard)"""
+        self._log_command('move_relative', north, east, down, yaw)
+        async def _move(north, east, down, yaw):
             try:
-                # Engage offboard if not active
-                if not self.offboard_active:
-                    # Get current position
-                    pos_ned = await self.drone.telemetry.position_velocity_ned().__anext__()
-                    current_north = pos_ned.position.north_m
-                    current_east = pos_ned.position.east_m
-                    current_down = pos_ned.position.down_m
-
-                    # Send setpoints before starting offboard
-                    for _ in range(10):
-                        await self.drone.offboard.set_position_ned(
-                            PositionNedYaw(current_north, current_east, current_down, 0)
-                        )
-                        await asyncio.sleep(0.2)
-
-                    # Start offboard
-                    await self.drone.offboard.start()
-                    self.offboard_active = True
-                    print("✅ Offboard mode active for manual control")
-
-                # Calculate new position relative to current
-                new_north = self.position_north + north
-                new_east = self.position_east + east
-                new_down = -(self.altitude + down)  # down is negative in NED
-
-                # Send position command
-                await self.drone.offboard.set_position_ned(
-                    PositionNedYaw(new_north, new_east, new_down, yaw)
-                )
-                print(f"Moving: N+{north}, E+{east}, D+{down}, Yaw={yaw}")
+                # Offsets accumulate on the streamed target, so quick repeated
+                # presses add up instead of all starting from a lagging position
+                if self.setpoint is not None:
+                    base_north, base_east, base_down, base_yaw = self.setpoint
+                else:
+                    t = self.telemetry
+                    base_north, base_east, base_down, base_yaw = t.north, t.east, -t.altitude, t.yaw
+
+                target = (base_north + north, base_east + east, base_down + down, (base_yaw + yaw) % 360)
+                await self._set_target(*target)
+                print(f"Moving: N+{north}, E+{east}, D+{down}, Yaw+{yaw}")
+                return self._approaching(*target)
 
             except Exception as e:
                 print(f"✗ Move relative failed: {e}")
+                raise
 
-        self._run_async(_move())
+        # Presses still waiting in the queue merge into one move
+        return self.commands.submit('move_relative', _move, (north, east, down, yaw),
+                                    merge=lambda pending, new: tuple(map(sum, zip(pending, new))))
+
+    def get_command_stats(self):
+        """Get command queue statistics"""
+        return self.commands.get_stats()
 
     # Manual control commands for controller sidebar
     def up(self):
         """Throttle up (increase altitude by 0.5m)"""
-        self.move_relative(down=-0.5)  # Negative down = up
+        return self.move_relative(down=-0.5)  # Negative down = up
 
     def down(self):
         """Throttle down (decrease altitude by 0.5m)"""
-        self.move_relative(down=0.5)  # Positive down = down
+        return self.move_relative(down=0.5)  # Positive down = down
 
     def forward(self):
         """Pitch forward (move 0.5m north)"""
-        self.move_relative(north=0.5)
+        return self.move_relative(north=0.5)
 
     def back(self):
         """Pitch back (move 0.5m south)"""
-        self.move_relative(north=-0.5)
+        return self.move_relative(north=-0.5)
 
     def left(self):
         """Roll left (move 0.5m west)"""
-        self.move_relative(east=-0.5)
+        return self.move_relative(east=-0.5)
 
     def right(self):
         """Roll right (move 0.5m east)"""
-        self.move_relative(east=0.5)
+        return self.move_relative(east=0.5)
 
     def clockwise(self):
         """Yaw clockwise (rotate 15 degrees)"""
-        self.move_relative(yaw=15)
+        return self.move_relative(yaw=15)
 
     def counterclockwise(self):
         """Yaw counterclockwise (rotate -15 degrees)"""
-        self.move_relative(yaw=-15)
+        return self.move_relative(yaw=-15)
 
     def stop(self):
         """Stop movement (hold current position)"""
+        self._log_command('stop')
         async def _stop():
             try:
                 if self.offboard_active:
                     # Set current position as target to stop movement
-                    await self.drone.offboard.set_position_ned(
-                        PositionNedYaw(
-                            self.position_north,
-                            self.position_east,
-                            -self.altitude,
-                            0
-                        )
-                    )
+                    t = self.telemetry
+                    yaw = self.setpoint[3] if self.setpoint else t.yaw
+                    await self._set_target(t.north, t.east, -t.altitude, yaw)
                     print("✅ Holding position")
+                    return lambda t: math.hypot(t.velocity_north, t.velocity_east,
+                                                t.velocity_down) < self.CONFIRM_HOLD_SPEED
             except Exception as e:
                 print(f"✗ Stop failed: {e}")
+                raise
+
+        return self.commands.submit('stop', _stop)
+
+    # Telemetry getters (each reads one snapshot, so values are always consistent)
+
+    @property
+    def telemetry_seq(self):
+        return self.telemetry.seq
+
+    @property
+    def connected(self):
+        return self.telemetry.connected
 
-        self._run_async(_stop())
+    @property
+    def armed(self):
+        return self.telemetry.armed
 
-    # Telemetry getters
+    @property
+    def in_air(self):
+        return self.telemetry.in_air
+
+    @property
+    def flight_mode(self):
+        return self.telemetry.flight_mode
+
+    @property
+    def position_north(self):
+        return self.telemetry.north
+
+    @property
+    def position_east(self):
+        return self.telemetry.east
 
-    def get_position(self):
+    @property
+    def altitude(self):
+        return self.telemetry.altitude
+
+    @property
+    def battery(self):
+        return self.telemetry.battery
+
+    def get_position(self, snapshot=None):
         """Get current position"""
+        t = snapshot or self.telemetry
         return {
-            'north': self.position_north,
-            'east': self.position_east,
-            'altitude': self.altitude
+            'north': t.north,
+            'east': t.east,
+            'altitude': t.altitude
         }
 
-    def get_status(self):
+    def get_status(self, snapshot=None):
         """Get drone status"""
+        t = snapshot or self.telemetry
         return {
-            'connected': self.connected,
-            'armed': self.armed,
-            'in_air': self.in_air,
+            'connected': t.connected,
+            'armed': t.armed,
+            'in_air': t.in_air,
             'offboard_active': self.offboard_active,
-            'flight_mode': self.flight_mode,
-            'battery': self.battery
+            'flight_mode': t.flight_mode,
+            'battery': t.battery
         }
 
+    def get_telemetry(self, snapshot=None):
+        """Get position and status as the /api/telemetry/ payload"""
+        t = snapshot or self.telemetry
+        return {
+            'seq': t.seq,
+            'timestamp': t.timestamp,
+            'altitude': t.altitude,
+            'pitch': t.pitch,
+            'roll': t.roll,
+            'yaw': t.yaw,
+            'battery': t.battery,
+            'throttle': 0,
+            'position': self.get_position(t),
+            'velocity': {
+                'north': t.velocity_north,
+                'east': t.velocity_east,
+                'down': t.velocity_down
+            },
+            'gps': {
+                'satellites': t.satellites,
+                'fix_type': t.gps_fix
+            },
+            'health_ok': t.health_ok,
+            'flight_mode': t.flight_mode,
+            'in_air': t.in_air,
+            'armed': t.armed,
+            'connected': t.connected
+        }
+
+    def get_telemetry_json(self):
+        """Get (seq, JSON telemetry), serialized at most once per update for all readers"""
+        snapshot = self.telemetry
+        cached_seq, payload = self._telemetry_json
+        if cached_seq != snapshot.seq:
+            payload = json.dumps(self.get_telemetry(snapshot))
+            self._telemetry_json = (snapshot.seq, payload)
+        return snapshot.seq, payload
+
+    def wait_for_telemetry(self, last_seq, timeout=15.0):
+        """
+        Block until telemetry newer than last_seq exists
+
+        Returns: the latest seq (equal to last_seq on timeout)
+        """
+        with self.telemetry_cond:
+            self.telemetry_cond.wait_for(lambda: self.telemetry.changed_since(last_seq), timeout)
+            return self.telemetry.seq
+
     # Legacy compatibility methods (for old backend API)
 
     @property
@@ -365,15 +672,15 @@ class MAVSDKDroneBackend:
 
     @property
     def pitch_str(self):
-        return "Pitch: 0.0"
+        return f"Pitch: {self.telemetry.pitch:.1f}"
 
     @property
     def roll_str(self):
-        return "Roll: 0.0"
+        return f"Roll: {self.telemetry.roll:.1f}"
 
     @property
     def yaw_str(self):
-        return "Yaw: 0.0"
+        return f"Yaw: {self.telemetry.yaw:.1f}"
 
     @property
     def throttle(self):
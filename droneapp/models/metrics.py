@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Metrics
+-------
+Lightweight thread-safe latency statistics for the camera and command pipelines
+"""
+
+import threading
+from collections import deque
+
+
+def _percentile(samples, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not samples:
+        return 0.0
+    return samples[min(len(samples) - 1, int(round(pct / 100.0 * (len(samples) - 1))))]
+
+
+class LatencyStats:
+    """Rolling latency statistics over the most recent samples"""
+
+    def __init__(self, window=1000):
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self.count = 0
+        self.max = 0.0
+
+    def record(self, seconds):
+        """Record one latency sample in seconds"""
+        with self._lock:
+            self._samples.append(seconds)
+            self.count += 1
+            if seconds > self.max:
+                self.max = seconds
+
+    def percentile(self, pct):
+        """Latency percentile (0-100) over the window, in seconds"""
+        with self._lock:
+            samples = sorted(self._samples)
+        return _percentile(samples, pct)
+
+    def to_dict(self):
+        """Summary in milliseconds for JSON endpoints"""
+        with self._lock:
+            samples = sorted(self._samples)
+            count, max_s = self.count, self.max
+        return {
+            'count': count,
+            'avg_ms': round(sum(samples) / len(samples) * 1000, 3) if samples else 0.0,
+            'p50_ms': round(_percentile(samples, 50) * 1000, 3),
+            'p99_ms': round(_percentile(samples, 99) * 1000, 3),
+            'max_ms': round(max_s * 1000, 3),
+        }
+
+
+class LatencyHistogram(LatencyStats):
+    """LatencyStats that also counts every sample into fixed millisecond buckets"""
+
+    # Bucket upper bounds in ms; the last bucket takes everything above
+    BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000)
+
+    def __init__(self, window=1000):
+        super().__init__(window)
+        self.buckets = [0] * (len(self.BUCKETS_MS) + 1)
+
+    def record(self, seconds):
+        """Record one latency sample in seconds"""
+        super().record(seconds)
+        ms = seconds * 1000
+        i = 0
+        while i < len(self.BUCKETS_MS) and ms > self.BUCKETS_MS[i]:
+            i += 1
+        with self._lock:
+            self.buckets[i] += 1
+
+    def to_dict(self):
+        """Summary in milliseconds plus {'<=bound_ms': count} over all samples"""
+        result = super().to_dict()
+        with self._lock:
+            buckets = list(self.buckets)
+        labels = [f"<={bound}" for bound in self.BUCKETS_MS] + [f">{self.BUCKETS_MS[-1]}"]
+        result['histogram_ms'] = dict(zip(labels, buckets))
+        return result
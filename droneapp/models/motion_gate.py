@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Motion Gate
+-----------
+Cheap change detection on a tiny block-averaged grayscale thumbnail, so
+that expensive vision work can skip frames that did not change. The
+decision is per grid cell, so a small object moving in an otherwise
+static scene still counts as a change.
+"""
+
+import time
+
+import numpy as np
+
+from droneapp.models.metrics import LatencyStats
+
+
+class MotionGate:
+    """Vectorized frame-difference gate over a block-averaged grayscale grid"""
+
+    def __init__(self, threshold=8.0, max_unchanged=30, grid=(32, 24), min_cells=1):
+        """
+        Args:
+            threshold: grayscale difference (0-255) of a cell's mean that counts as a change in it
+            max_unchanged: report a frame as changed after this many unchanged frames anyway
+            grid: (columns, rows) of the thumbnail the difference is computed on
+            min_cells: changed cells needed for the frame to count as changed
+        """
+        self.threshold = threshold
+        self.max_unchanged = max_unchanged
+        self.grid = grid
+        self.min_cells = min_cells
+
+        # Thumbnail of the last frame that passed the gate
+        self.reference = None
+        self.unchanged_run = 0
+        # Largest cell difference and number of changed cells of the last frame
+        self.last_score = 0.0
+        self.last_changed_cells = 0
+        self.frames_checked = 0
+        self.frames_unchanged = 0
+        self.cost = LatencyStats()
+
+    def thumbnail(self, img_array):
+        """Grayscale thumbnail (float32, 0-255): the mean of every pixel in each grid cell"""
+        height, width = img_array.shape[:2]
+        rows = min(self.grid[1], height)
+        columns = min(self.grid[0], width)
+        cell_height, cell_width = height // rows, width // columns
+        if img_array.ndim == 3:
+            # Channel order does not matter for an unweighted average
+            img_array = img_array[..., :3]
+        channels = img_array.shape[2] if img_array.ndim == 3 else 1
+
+        # Sum each cell's rows, then its columns (and channels); the
+        # remainder at the right and bottom edges is left out
+        cells = img_array[:rows * cell_height, :columns * cell_width]
+        sums = cells.reshape(rows, cell_height, -1).sum(axis=1, dtype=np.uint32)
+        sums = sums.reshape(rows, columns, -1).sum(axis=2)
+        return sums.astype(np.float32) / (cell_height * cell_width * channels)
+
+    def update(self, img_array):
+        """
+        Check a frame against the last frame that passed
+
+        Returns: True if the frame changed (or is due as a keyframe)
+        """
+        start = time.monotonic()
+        thumb = self.thumbnail(img_array)
+        self.frames_checked += 1
+
+        if self.reference is None or self.reference.shape != thumb.shape:
+            changed = True
+            self.last_score = 255.0
+            self.last_changed_cells = thumb.size
+        else:
+            difference = np.abs(thumb - self.reference)
+            self.last_score = float(difference.max())
+            self.last_changed_cells = int(np.count_nonzero(difference >= self.threshold))
+            changed = (self.last_changed_cells >= self.min_cells or
+                       self.unchanged_run + 1 >= self.max_unchanged)
+
+        if changed:
+            self.reference = thumb
+            self.unchanged_run = 0
+        else:
+            self.unchanged_run += 1
+            self.frames_unchanged += 1
+
+        self.cost.record(time.monotonic() - start)
+        return changed
+
+    def get_stats(self):
+        """Get gate statistics"""
+        return {
+            'threshold': self.threshold,
+            'max_unchanged': self.max_unchanged,
+            'min_cells': self.min_cells,
+            'last_score': round(self.last_score, 3),
+            'last_changed_cells': self.last_changed_cells,
+            'frames_checked': self.frames_checked,
+            'frames_unchanged': self.frames_unchanged,
+            'skip_ratio': round(self.frames_unchanged / self.frames_checked, 3) if self.frames_checked else 0.0,
+            'cost': self.cost.to_dict(),
+        }
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+ROS2 Camera Bridge
+------------------
+One rclpy node and MultiThreadedExecutor shared by every CameraStream
+"""
+
+import threading
+
+
+class RosCameraBridge:
+    """Singleton owner of the rclpy node, executor and spin thread"""
+
+    _instance = None
+    _lock = threading.Lock()
+
+    # Executor threads; each stream's callback group is mutually exclusive,
+    # so this bounds how many streams can ingest a frame at the same time
+    EXECUTOR_THREADS = 4
+
+    @classmethod
+    def get_instance(cls):
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+        return cls._instance
+
+    def __init__(self):
+        self.node = None
+        self.executor = None
+        self.thread = None
+        self.running = False
+        self.subscriptions = {}
+        self._failure_callbacks = []
+        self._start_lock = threading.Lock()
+
+        # Try to import ROS2
+        try:
+            import rclpy
+            from rclpy.callback_groups import MutuallyExclusiveCallbackGroup
+            from rclpy.executors import MultiThreadedExecutor
+            from sensor_msgs.msg import Image as RosImage
+
+            self.rclpy = rclpy
+            self.MutuallyExclusiveCallbackGroup = MutuallyExclusiveCallbackGroup
+            self.MultiThreadedExecutor = MultiThreadedExecutor
+            self.RosImage = RosImage
+            self.available = True
+            print("📷 ROS2 available")
+        except ImportError as e:
+            print(f"⚠️ ROS2 not available, using placeholder: {e}")
+            self.available = False
+
+    def _start(self):
+        """Initialize rclpy and start the shared spin thread (once)"""
+        with self._start_lock:
+            if self.running:
+                return
+            self.rclpy.init()
+            self.node = self.rclpy.create_node('camera_stream_node')
+            self.executor = self.MultiThreadedExecutor(num_threads=self.EXECUTOR_THREADS)
+            self.executor.add_node(self.node)
+            self.running = True
+            self.thread = threading.Thread(target=self._spin, name="ros2-camera-spin", daemon=True)
+            self.thread.start()
+
+    def subscribe_images(self, topic, callback, on_failure=None):
+        """
+        Subscribe callback(msg) to a sensor_msgs/Image topic
+
+        Each subscription gets its own callback group, so streams are
+        processed in parallel while a single stream is never re-entered.
+        on_failure() is called if the spin thread dies.
+        """
+        self._start()
+        subscription = self.node.create_subscription(
+            self.RosImage,
+            topic,
+            callback,
+            1,  # QoS depth: only the newest image matters
+            callback_group=self.MutuallyExclusiveCallbackGroup()
+        )
+        self.subscriptions[topic] = subscription
+        if on_failure is not None:
+            self._failure_callbacks.append(on_failure)
+        print(f"✅ Subscribed to ROS2 {topic} topic, waiting for frames...")
+        return subscription
+
+    def _spin(self):
+        """Process callbacks for every subscribed stream"""
+        try:
+            while self.running:
+                self.executor.spin_once(timeout_sec=0.1)
+
+            # Cleanup
+            self.executor.shutdown()
+            self.node.destroy_node()
+            self.rclpy.shutdown()
+
+        except Exception as e:
+            print(f"ROS2 camera error: {e}, falling back to placeholder")
+            import traceback
+            traceback.print_exc()
+            self.running = False
+            for on_failure in self._failure_callbacks:
+                on_failure()
+
+    def stop(self):
+        """Stop spinning and shut down rclpy"""
+        self.running = False
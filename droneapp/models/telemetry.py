@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Telemetry Snapshot
+------------------
+Immutable, versioned view of the vehicle state. The MAVSDK monitors build
+a new snapshot for every update and publish it with a single attribute
+assignment, so readers on other threads always see one consistent sample.
+"""
+
+import time
+
+
+class TelemetrySnapshot:
+    """Immutable telemetry sample; seq increases by one per update"""
+
+    __slots__ = ('seq', 'timestamp', 'connected', 'armed', 'in_air', 'flight_mode',
+                 'north', 'east', 'altitude', 'velocity_north', 'velocity_east', 'velocity_down',
+                 'roll', 'pitch', 'yaw', 'battery', 'satellites', 'gps_fix', 'health_ok')
+
+    FIELDS = __slots__[2:]
+
+    def __init__(self, seq=0, timestamp=None, connected=False, armed=False, in_air=False,
+                 flight_mode="IDLE", north=0.0, east=0.0, altitude=0.0,
+                 velocity_north=0.0, velocity_east=0.0, velocity_down=0.0,
+                 roll=0.0, pitch=0.0, yaw=0.0, battery=100.0,
+                 satellites=0, gps_fix=0, health_ok=False):
+        values = (seq, time.time() if timestamp is None else timestamp, connected, armed,
+                  in_air, flight_mode, north, east, altitude,
+                  velocity_north, velocity_east, velocity_down, roll, pitch, yaw, battery,
+                  satellites, gps_fix, health_ok)
+        for name, value in zip(self.__slots__, values):
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("TelemetrySnapshot is immutable; use replace()")
+
+    def __delattr__(self, name):
+        raise AttributeError("TelemetrySnapshot is immutable")
+
+    def __repr__(self):
+        fields = ', '.join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"TelemetrySnapshot({fields})"
+
+    def replace(self, **changes):
+        """New snapshot with the given fields changed, the next seq and a fresh timestamp"""
+        values = {name: getattr(self, name) for name in self.FIELDS}
+        values.update(changes)
+        return TelemetrySnapshot(self.seq + 1, time.time(), **values)
+
+    def changed_since(self, seq):
+        return self.seq != seq
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
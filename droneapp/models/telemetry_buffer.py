@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Telemetry History
+-----------------
+Fixed-capacity ring buffer of telemetry samples in columnar NumPy arrays,
+with time-range queries downsampled to min/mean/max per bucket for plots,
+flight analysis and visualization trails.
+"""
+
+import numpy as np
+
+
+class TelemetryBuffer:
+    """
+    Columnar ring buffer filled from TelemetrySnapshots
+
+    Appends write one scalar per column into preallocated arrays (O(1), no
+    allocation). There is a single writer (the MAVSDK event loop); readers
+    copy only the rows of the requested range and skip a small guard band
+    at the old end that the writer may be overwriting.
+    """
+
+    # column -> dtype; names are TelemetrySnapshot fields
+    COLUMNS = {
+        'timestamp': np.float64,
+        'north': np.float32,
+        'east': np.float32,
+        'altitude': np.float32,
+        'velocity_north': np.float32,
+        'velocity_east': np.float32,
+        'velocity_down': np.float32,
+        'roll': np.float32,
+        'pitch': np.float32,
+        'yaw': np.float32,
+        'battery': np.float32,
+    }
+    GUARD_ROWS = 64
+
+    def __init__(self, capacity=500000):
+        self.capacity = capacity
+        self.columns = {name: np.zeros(capacity, dtype) for name, dtype in self.COLUMNS.items()}
+        self._items = tuple(self.columns.items())
+        # Rows ever appended; the only state shared with readers
+        self.total = 0
+
+    def append(self, snapshot):
+        """Append one sample (called from the writer thread only)"""
+        i = self.total % self.capacity
+        for name, column in self._items:
+            column[i] = getattr(snapshot, name)
+        self.total += 1
+
+    def __len__(self):
+        return min(self.total, self.capacity)
+
+    def _segments(self):
+        """Chronological (lo, hi) index ranges of the stored rows"""
+        total = self.total
+        if total <= self.capacity:
+            return [(0, total)]
+        head = total % self.capacity
+        start = min(head + self.GUARD_ROWS, self.capacity)
+        return [(start, self.capacity), (0, head)]
+
+    def query(self, start=None, end=None, fields=None):
+        """
+        Rows with start <= timestamp <= end
+
+        Returns: {column: array} (copies) for 'timestamp' and the requested fields
+        """
+        fields = [name for name in (self.COLUMNS if fields is None else fields)
+                  if name in self.COLUMNS and name != 'timestamp']
+        timestamps = self.columns['timestamp']
+        ranges = []
+        for lo, hi in self._segments():
+            segment = timestamps[lo:hi]
+            a = lo if start is None else lo + int(np.searchsorted(segment, start, 'left'))
+            b = hi if end is None else lo + int(np.searchsorted(segment, end, 'right'))
+            if a < b:
+                ranges.append((a, b))
+
+        result = {}
+        for name in ['timestamp'] + fields:
+            column = self.columns[name]
+            parts = [column[a:b] for a, b in ranges]
+            result[name] = np.concatenate(parts) if parts else column[:0].copy()
+        return result
+
+    def downsample(self, start=None, end=None, points=500, fields=None):
+        """
+        Range query reduced to at most `points` buckets of equal sample count
+
+        Returns: {'timestamp': first timestamp per bucket,
+                  field: {'min': ..., 'mean': ..., 'max': ...}, ...}
+        """
+        rows = self.query(start, end, fields)
+        timestamps = rows.pop('timestamp')
+        count = len(timestamps)
+        if count <= points:
+            return dict(timestamp=timestamps,
+                        **{name: {'min': values, 'mean': values, 'max': values}
+                           for name, values in rows.items()})
+
+        bounds = np.linspace(0, count, points + 1).astype(np.int64)[:-1]
+        sizes = np.diff(np.append(bounds, count))
+        result = {'timestamp': timestamps[bounds]}
+        for name, values in rows.items():
+            result[name] = {
+                'min': np.minimum.reduceat(values, bounds),
+                'mean': (np.add.reduceat(values, bounds, dtype=np.float64) / sizes).astype(np.float32),
+                'max': np.maximum.reduceat(values, bounds),
+            }
+        return result
+
+    def get_stats(self):
+        """Get buffer statistics"""
+        total = self.total
+        timestamps = self.columns['timestamp']
+        return {
+            'capacity': self.capacity,
+            'rows': len(self),
+            'appended': total,
+            'bytes': sum(column.nbytes for column in self.columns.values()),
+            'oldest': float(timestamps[self._segments()[0][0]]) if total else None,
+            'newest': float(timestamps[(total - 1) % self.capacity]) if total else None,
+        }
@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+H.264 Video Stream
+------------------
+Low-bandwidth inter-frame video for remote operators. Raw frames from a
+CameraStream are piped into one persistent ffmpeg (libx264) process per
+variant, and its output is fanned out to every client of that variant as
+either fragmented MP4 or a raw Annex-B elementary stream.
+
+New clients join at the next keyframe: an MP4 fragment (the muxer starts a
+fragment at every keyframe) or an Annex-B SPS. Slow clients are dropped
+back to the next keyframe rather than buffering without bound.
+"""
+
+import os
+import queue
+import re
+import struct
+import threading
+import time
+
+# Annex-B start code followed by a sequence parameter set NAL (type 7)
+SPS_START = re.compile(b'\x00\x00\x01[\x07\x27\x47\x67]')
+MP4_BOX = struct.Struct('>I4s')
+# Empty top-level box players skip; written to idle MP4 clients
+MP4_FREE_BOX = MP4_BOX.pack(MP4_BOX.size, b'free')
+
+
+class VideoClient:
+    """One HTTP client of an H264Stream"""
+
+    def __init__(self, queue_size):
+        self.queue = queue.Queue(maxsize=queue_size)
+        # Waiting for the next keyframe (on join and after an overflow)
+        self.synced = False
+        self.started = False
+        self.dropped = 0
+
+    def get(self, timeout=1.0):
+        """Next chunk of the stream, or None on timeout"""
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+
+class H264Stream:
+    """Shared ffmpeg encoder for one (camera, width, bitrate, keyint, container) variant"""
+
+    _streams = {}
+    _lock = threading.Lock()
+
+    # container -> (ffmpeg muxer, MIME type)
+    CONTAINERS = {
+        'mp4': ('mp4', 'video/mp4'),
+        'h264': ('h264', 'video/h264'),
+    }
+    CLIENT_QUEUE_SIZE = 64
+    READ_SIZE = 64 * 1024
+    # Without a new camera frame for this long, the last one is encoded
+    # again, so output keeps flowing to clients of a static camera
+    REPEAT_INTERVAL = 1.0
+
+    @classmethod
+    def subscribe(cls, camera, width=None, kbps=250, keyint=10, container='mp4'):
+        """
+        Join (or start) the encoder for a variant
+
+        Returns: (stream, client); call stream.unsubscribe(client) when done
+        """
+        if container not in cls.CONTAINERS:
+            raise ValueError(f"Unsupported container: {container}")
+        width = camera.normalize_variant(width)[0]
+        key = (camera.name, width, kbps, keyint, container)
+        with cls._lock:
+            stream = cls._streams.get(key)
+            if stream is None or not stream.running:
+                stream = cls._streams[key] = cls(camera, width, kbps, keyint, container)
+            client = VideoClient(cls.CLIENT_QUEUE_SIZE)
+            stream.clients.append(client)
+        return stream, client
+
+    @classmethod
+    def camera_stats(cls, camera):
+        """Statistics of every running variant of a camera"""
+        return [stream.get_stats() for stream in list(cls._streams.values())
+                if stream.camera is camera]
+
+    def __init__(self, camera, width, kbps, keyint, container):
+        import ffmpeg  # ffmpeg-python; only needed once someone asks for video
+
+        self.ffmpeg = ffmpeg
+        self.camera = camera
+        self.width = width
+        self.kbps = kbps
+        self.keyint = keyint
+        self.container = container
+        self.mimetype = self.CONTAINERS[container][1]
+        self.clients = []
+
+        self.process = None
+        self.size = None
+        # MP4 initialization segment (ftyp + moov) sent to every joining client
+        self.init = b''
+        self._pending = b''
+        self.frames_in = 0
+        self.frames_repeated = 0
+        self.bytes_out = 0
+        self.started = time.monotonic()
+
+        self.running = True
+        self.thread = threading.Thread(target=self._feed_loop,
+                                       name=f"{camera.name}-h264-feed", daemon=True)
+        self.thread.start()
+        print(f"🎞 H.264 stream started on '{camera.name}': {container}, {kbps} kbps, keyint {keyint}")
+
+    def _start_process(self, size, mode):
+        """Start ffmpeg for raw frames of the given size and PIL mode"""
+        output_args = {
+            'format': self.CONTAINERS[self.container][0],
+            'vcodec': 'libx264',
+            'preset': 'veryfast',
+            'tune': 'zerolatency',
+            'pix_fmt': 'yuv420p',
+            # yuv420p needs even dimensions
+            'vf': 'scale=trunc(iw/2)*2:trunc(ih/2)*2',
+            'g': self.keyint,
+            'b:v': f"{self.kbps}k",
+            'maxrate': f"{self.kbps}k",
+            'bufsize': f"{self.kbps}k",
+            # Frames arrive at the camera's (variable) rate
+            'vsync': 'vfr',
+            'flush_packets': 1,
+        }
+        if self.container == 'mp4':
+            output_args['movflags'] = 'frag_keyframe+empty_moov+default_base_moof'
+
+        self.size = size
+        self.process = (
+            self.ffmpeg
+            .input('pipe:', format='rawvideo', pix_fmt='gray' if mode == 'L' else 'rgb24',
+                   s=f"{size[0]}x{size[1]}", use_wallclock_as_timestamps=1)
+            .output('pipe:', **output_args)
+            .global_args('-hide_banner', '-loglevel', 'error')
+            .run_async(pipe_stdin=True, pipe_stdout=True)
+        )
+        threading.Thread(target=self._read_loop, args=(self.process,),
+                         name=f"{self.camera.name}-h264-read", daemon=True).start()
+
+    def _feed_loop(self):
+        """Write each new camera frame into ffmpeg as raw pixels"""
+        last_id = 0
+        mode = None
+        frame = None
+        try:
+            while self.running and self.camera.running:
+                if self.camera.wait_for_frame_id(last_id, timeout=self.REPEAT_INTERVAL) <= last_id:
+                    if frame is not None:
+                        self.process.stdin.write(frame)
+                        self.frames_repeated += 1
+                    continue
+                last_id, _, img = self.camera.get_image(self.width)
+
+                if self.process is None:
+                    mode = img.mode
+                    self._start_process(img.size, mode)
+                if img.size != self.size or img.mode != mode:
+                    # The encoder's input size is fixed once started
+                    img = img.convert(mode).resize(self.size)
+                frame = img.tobytes()
+                self.process.stdin.write(frame)
+                self.frames_in += 1
+        except (BrokenPipeError, OSError, ValueError) as e:
+            # ValueError: stdin was closed by stop() while writing
+            if self.running:
+                print(f"H.264 encoder error: {e}")
+        finally:
+            self.stop()
+
+    def _read_loop(self, process):
+        """Fan ffmpeg output out to the clients"""
+        fd = process.stdout.fileno()
+        while True:
+            chunk = os.read(fd, self.READ_SIZE)
+            if not chunk:
+                break
+            self.bytes_out += len(chunk)
+            if self.container == 'mp4':
+                self._split_mp4(chunk)
+            else:
+                self._split_annexb(chunk)
+        process.wait()
+        self.running = False
+
+    def _split_annexb(self, chunk):
+        """Forward raw H.264; a client may join at the first SPS in the chunk"""
+        # Keep the previous chunk's tail so a start code split across reads is found
+        data = self._pending + chunk
+        match = SPS_START.search(data)
+        self._pending = chunk[-3:]
+        self._dispatch(chunk, data[match.start():] if match else None)
+
+    def _split_mp4(self, chunk):
+        """Forward complete MP4 boxes; a client may join at any moof"""
+        data = self._pending + chunk
+        offset = 0
+        while len(data) - offset >= MP4_BOX.size:
+            size, box_type = MP4_BOX.unpack_from(data, offset)
+            if size == 1:
+                if len(data) - offset < 16:
+                    break
+                size = struct.unpack_from('>Q', data, offset + 8)[0]
+            if len(data) - offset < size:
+                break
+            box = data[offset:offset + size]
+            offset += size
+
+            if box_type == b'ftyp':
+                self.init = box
+            elif box_type == b'moov':
+                self.init += box
+            else:
+                self._dispatch(box, box if box_type == b'moof' else None)
+        self._pending = data[offset:]
+
+    def _dispatch(self, data, join):
+        """Queue data for synced clients; unsynced clients start from join (a keyframe)"""
+        with H264Stream._lock:
+            clients = list(self.clients)
+        for client in clients:
+            if not client.synced:
+                if join is None:
+                    continue
+                data_out = join if client.started else self.init + join
+                client.synced = client.started = True
+            else:
+                data_out = data
+            try:
+                client.queue.put_nowait(data_out)
+            except queue.Full:
+                # Too slow for the link: skip ahead to the next keyframe
+                client.synced = False
+                client.dropped += 1
+
+    def keepalive(self, client):
+        """
+        Bytes that can safely be written to a client that got nothing for a
+        while, or None
+
+        A closed connection is only noticed on a write. MP4 clients get an
+        empty box between complete boxes; Annex-B has no such filler and
+        relies on the repeated frames from the feed loop.
+        """
+        if self.container == 'mp4' and client.started:
+            return MP4_FREE_BOX
+        return None
+
+    def unsubscribe(self, client):
+        """Remove a client; the encoder stops with its last client"""
+        with H264Stream._lock:
+            if client in self.clients:
+                self.clients.remove(client)
+            last = not self.clients
+            if last:
+                for key, stream in list(H264Stream._streams.items()):
+                    if stream is self:
+                        del H264Stream._streams[key]
+        if last:
+            self.stop()
+
+    def stop(self):
+        """Stop feeding ffmpeg and let it exit"""
+        self.running = False
+        process = self.process
+        if process is not None and process.stdin and not process.stdin.closed:
+            try:
+                process.stdin.close()
+            except OSError:
+                pass
+
+    def get_stats(self):
+        """Get encoder statistics"""
+        elapsed = time.monotonic() - self.started
+        return {
+            'container': self.container,
+            'width': self.width,
+            'kbps': self.kbps,
+            'keyint': self.keyint,
+            'running': self.running,
+            'clients': len(self.clients),
+            'frames_in': self.frames_in,
+            'frames_repeated': self.frames_repeated,
+            'bytes_out': self.bytes_out,
+            'measured_kbps': round(self.bytes_out * 8 / 1000 / elapsed, 1) if elapsed else 0.0,
+            'client_drops': sum(client.dropped for client in self.clients),
+        }
@@ -205,21 +205,16 @@ class DroneVisualization {
     }
 
     startTelemetryUpdates() {
-        // Poll telemetry data every 100ms
-        setInterval(() => {
-            this.fetchTelemetry();
-        }, 100);
-    }
-
-    async fetchTelemetry() {
-        try {
-            const response = await fetch('/api/telemetry/');
-            const data = await response.json();
+        // Telemetry is pushed by the server; EventSource reconnects on its own
+        this.telemetrySource = new EventSource('/api/telemetry/stream');
+        this.telemetrySource.onmessage = (event) => {
+            const data = JSON.parse(event.data);
             this.telemetry = data;
             this.updateDrone(data);
-        } catch (error) {
-            console.error('Failed to fetch telemetry:', error);
-        }
+        };
+        this.telemetrySource.onerror = () => {
+            console.error('Telemetry stream error, reconnecting...');
+        };
     }
 
     animate() {
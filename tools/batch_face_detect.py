@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Batch Face Detection
+--------------------
+Scan every frame of a camera recording (see camera_recorder.py) or a
+directory of images for faces, using a process pool with one cascade per
+worker. Results are written as JSON lines, one per frame with detections:
+
+  {"frame_id": 42, "timestamp": 1700000000.5, "faces": [[x, y, w, h], ...]}
+
+Usage:
+  python tools/batch_face_detect.py recordings/camera-20240101-120000 -o faces.jsonl
+  python tools/batch_face_detect.py ~/photos --workers 8 --width 640
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+
+import cv2 as cv
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from droneapp.models.camera_recorder import INDEX_FILE, RecordingReader
+from droneapp.models.face_detector import EYE_CASCADE, FACE_CASCADE
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp', '.webp')
+
+# Per-process state set up by _init_worker
+_worker = {}
+
+
+def _init_worker(source, options):
+    """Load the cascades (and open the recording) once per worker process"""
+    cv.setNumThreads(1)
+    _worker['options'] = options
+    _worker['face'] = cv.CascadeClassifier(FACE_CASCADE)
+    _worker['eye'] = cv.CascadeClassifier(EYE_CASCADE) if options['eyes'] else None
+    _worker['reader'] = RecordingReader(source) if is_recording(source) else None
+
+
+def _detect_task(task):
+    """Decode and scan one frame; task is (frame_id, timestamp, recording index or file path)"""
+    frame_id, timestamp, key = task
+    options = _worker['options']
+    reader = _worker['reader']
+    if reader is not None:
+        data = np.frombuffer(reader.read(key)[2], dtype=np.uint8)
+    else:
+        data = np.fromfile(key, dtype=np.uint8)
+
+    # Decode straight to grayscale; the cascade never needs colour
+    gray = cv.imdecode(data, cv.IMREAD_GRAYSCALE)
+    if gray is None:
+        return frame_id, timestamp, None, None
+
+    scale = 1.0
+    if options['width'] and gray.shape[1] > options['width']:
+        scale = gray.shape[1] / options['width']
+        gray = cv.resize(gray, (options['width'], int(gray.shape[0] / scale)), interpolation=cv.INTER_AREA)
+
+    faces = _worker['face'].detectMultiScale(gray, options['scale_factor'], options['min_neighbors'])
+    eyes = []
+    if _worker['eye'] is not None:
+        for x, y, w, h in faces:
+            for ex, ey, ew, eh in _worker['eye'].detectMultiScale(gray[y:y + h, x:x + w]):
+                eyes.append((x + ex, y + ey, ew, eh))
+
+    return (frame_id, timestamp,
+            [[int(round(v * scale)) for v in box] for box in faces],
+            [[int(round(v * scale)) for v in box] for box in eyes])
+
+
+def is_recording(path):
+    return os.path.exists(os.path.join(path, INDEX_FILE))
+
+
+def list_tasks(source):
+    """[(frame_id, timestamp, key), ...] for every frame in a recording or image directory"""
+    if is_recording(source):
+        reader = RecordingReader(source)
+        try:
+            tasks = []
+            for i in range(len(reader)):
+                timestamp, frame_id = reader.record(i)[:2]
+                tasks.append((frame_id, timestamp, i))
+            return tasks
+        finally:
+            reader.close()
+
+    names = sorted(name for name in os.listdir(source) if name.lower().endswith(IMAGE_EXTENSIONS))
+    tasks = []
+    for i, name in enumerate(names):
+        path = os.path.join(source, name)
+        tasks.append((i, os.path.getmtime(path), path))
+    return tasks
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch face detection over a recording or image directory")
+    parser.add_argument('source', help="recording directory or directory of images")
+    parser.add_argument('-o', '--output', default='faces.jsonl', help="results file (JSON lines)")
+    parser.add_argument('-w', '--workers', type=int, default=os.cpu_count(), help="worker processes")
+    parser.add_argument('--width', type=int, default=0, help="downscale frames to this width first (0 = full size)")
+    parser.add_argument('--scale-factor', type=float, default=1.2)
+    parser.add_argument('--min-neighbors', type=int, default=5)
+    parser.add_argument('--eyes', action='store_true', help="also run the eye cascade inside each face")
+    parser.add_argument('--all', action='store_true', help="write a line for every frame, not only frames with faces")
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.source):
+        parser.error(f"Not a directory: {args.source}")
+
+    tasks = list_tasks(args.source)
+    if not tasks:
+        parser.error(f"No frames found in {args.source}")
+    options = {
+        'width': args.width,
+        'scale_factor': args.scale_factor,
+        'min_neighbors': args.min_neighbors,
+        'eyes': args.eyes,
+    }
+    print(f"🔍 Scanning {len(tasks)} frames from {args.source} with {args.workers} workers")
+
+    # Workers load frames themselves, so only small task tuples cross process boundaries
+    chunksize = max(1, min(32, len(tasks) // (args.workers * 8)))
+    start = time.monotonic()
+    last_report = start
+    done = frames_with_faces = unreadable = 0
+    with multiprocessing.Pool(args.workers, _init_worker, (args.source, options)) as pool, \
+            open(args.output, 'w') as out:
+        for frame_id, timestamp, faces, eyes in pool.imap(_detect_task, tasks, chunksize):
+            done += 1
+            if faces is None:
+                unreadable += 1
+            elif faces or args.all:
+                frames_with_faces += bool(faces)
+                result = {'frame_id': frame_id, 'timestamp': timestamp, 'faces': faces}
+                if args.eyes:
+                    result['eyes'] = eyes
+                out.write(json.dumps(result, separators=(',', ':')) + '\n')
+
+            now = time.monotonic()
+            if now - last_report >= 1.0 or done == len(tasks):
+                last_report = now
+                print(f"\r{done}/{len(tasks)} frames  {done / (now - start):.1f} frames/s  "
+                      f"{frames_with_faces} with faces", end='', file=sys.stderr, flush=True)
+
+    elapsed = time.monotonic() - start
+    print(file=sys.stderr)
+    print(f"✅ {done} frames in {elapsed:.1f}s ({done / elapsed:.1f} frames/s), "
+          f"{frames_with_faces} with faces, {unreadable} unreadable -> {args.output}")
+
+
+if __name__ == '__main__':
+    main()
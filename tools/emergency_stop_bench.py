@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Emergency Stop Latency Benchmark
+--------------------------------
+Measures how long an emergency stop takes from HTTP receipt to the
+action.kill() call while the backend is under load:
+
+- client threads flood /api/command/ with manual moves
+- a synthetic flight log is replayed through the telemetry monitors
+- a hog task holds the event loop for --hog-ms at a time
+- entering offboard takes --offboard-start-ms on the simulated vehicle, so
+  a move is usually in flight when the stop arrives
+
+The vehicle is simulated (no PX4 needed); everything between the HTTP
+handler and the MAVSDK call is the real backend.
+
+Usage:
+  python tools/emergency_stop_bench.py --trials 500 --clients 4
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from types import SimpleNamespace
+
+from flask import Flask, jsonify, request
+from werkzeug.serving import make_server
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from droneapp.models.command_queue import CommandQueueFull
+from droneapp.models.flight_log import FlightLogWriter
+from droneapp.models.mavsdk_backend import MAVSDKDroneBackend
+from droneapp.models.metrics import LatencyStats
+from droneapp.models.telemetry import TelemetrySnapshot
+
+MOVES = ('forward', 'back', 'left', 'right', 'up', 'down', 'clockwise', 'counterclockwise')
+
+
+class SimulatedVehicle:
+    """Stand-in for mavsdk.System's action and offboard plugins with fixed delays"""
+
+    def __init__(self, offboard_start_s):
+        self.offboard_start_s = offboard_start_s
+        self.kill_received = threading.Event()
+        self.kill_time = None
+        self.setpoints = 0
+        self.action = SimpleNamespace(kill=self._kill, land=self._ack, arm=self._ack,
+                                      takeoff=self._ack, set_takeoff_altitude=self._ack)
+        self.offboard = SimpleNamespace(set_position_ned=self._set_position_ned,
+                                        start=self._offboard_start, stop=self._ack)
+
+    async def _kill(self):
+        # The moment the backend hands the kill to MAVSDK
+        self.kill_time = time.monotonic()
+        self.kill_received.set()
+        await asyncio.sleep(0.005)
+
+    async def _ack(self, *args):
+        await asyncio.sleep(0.02)
+
+    async def _set_position_ned(self, setpoint):
+        self.setpoints += 1
+        await asyncio.sleep(0.001)
+
+    async def _offboard_start(self):
+        await asyncio.sleep(self.offboard_start_s)
+
+
+def write_synthetic_log(path, seconds, rate_hz=50):
+    """Flight log of a vehicle circling at 2 m, for the monitors to replay"""
+    writer = FlightLogWriter(path)
+    snapshot = TelemetrySnapshot(connected=True, armed=True, in_air=True, flight_mode='OFFBOARD',
+                                 altitude=2.0, satellites=10, gps_fix=3, health_ok=True)
+    start = time.time()
+    for i in range(int(seconds * rate_hz)):
+        t = i / rate_hz
+        snapshot = snapshot.replace(north=5.0 * (t % 7), east=3.0 * (t % 5), roll=t % 10,
+                                    yaw=(t * 20) % 360, battery=100.0 - t / 60)
+        object.__setattr__(snapshot, 'timestamp', start + t)
+        writer.log_telemetry(snapshot, {'north', 'east', 'roll', 'yaw', 'battery'})
+    writer.stop()
+
+
+def create_app(backend, receipts):
+    """Minimal copy of the /api/command/ route around the real backend"""
+    app = Flask(__name__)
+
+    @app.route('/api/command/', methods=['POST'])
+    def command():
+        received = time.monotonic()
+        cmd = request.form.get('command')
+        try:
+            with backend.commands.received_at(received):
+                if cmd == 'emergency_stop':
+                    receipts.append(received)
+                    backend.emergency_stop()
+                elif cmd in MOVES:
+                    getattr(backend, cmd)()
+                else:
+                    return jsonify(status='error', message=f"Unknown command: {cmd}"), 400
+        except CommandQueueFull as e:
+            return jsonify(status='busy', message=str(e)), 429
+        return jsonify(status='success'), 200
+
+    return app
+
+
+def post(url, command):
+    data = urllib.parse.urlencode({'command': command}).encode()
+    try:
+        with urllib.request.urlopen(url, data, timeout=10) as response:
+            return response.status
+    except urllib.error.HTTPError as e:
+        return e.code
+
+
+async def hog_loop(hog_s, stop):
+    """Hold the event loop for hog_s at a time, like a blocking callback would"""
+    while not stop.is_set():
+        end = time.perf_counter() + hog_s
+        while time.perf_counter() < end:
+            pass
+        await asyncio.sleep(0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--trials', type=int, default=300)
+    parser.add_argument('--clients', type=int, default=4, help='threads posting manual moves')
+    parser.add_argument('--hog-ms', type=float, default=2.0, help='event loop blocking slice')
+    parser.add_argument('--offboard-start-ms', type=float, default=500.0)
+    parser.add_argument('--port', type=int, default=0)
+    args = parser.parse_args()
+
+    log_path = os.path.join(tempfile.mkdtemp(), 'bench.flog')
+    write_synthetic_log(log_path, seconds=max(60, args.trials))
+
+    backend = MAVSDKDroneBackend(replay_path=log_path, replay_speed=1.0)
+    vehicle = SimulatedVehicle(args.offboard_start_ms / 1000)
+    backend.drone = vehicle
+    stop = threading.Event()
+    if args.hog_ms > 0:
+        asyncio.run_coroutine_threadsafe(hog_loop(args.hog_ms / 1000, stop), backend.loop)
+
+    receipts = []
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)
+    server = make_server('127.0.0.1', args.port, create_app(backend, receipts), threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/api/command/"
+
+    move_status = {}
+
+    def client():
+        while not stop.is_set():
+            status = post(url, random.choice(MOVES))
+            move_status[status] = move_status.get(status, 0) + 1
+            time.sleep(random.uniform(0, 0.02))
+
+    clients = [threading.Thread(target=client, daemon=True) for _ in range(args.clients)]
+    for thread in clients:
+        thread.start()
+    time.sleep(1.0)
+
+    latency = LatencyStats(window=args.trials)
+    missed = 0
+    print(f"Running {args.trials} emergency stops with {args.clients} move clients, "
+          f"{args.hog_ms:g} ms loop hog...")
+    for _ in range(args.trials):
+        # Let moves queue up and one get in flight before each stop
+        time.sleep(random.uniform(0.05, 0.15))
+        vehicle.kill_received.clear()
+        post(url, 'emergency_stop')
+        if vehicle.kill_received.wait(timeout=5):
+            latency.record(vehicle.kill_time - receipts[-1])
+        else:
+            missed += 1
+
+    stop.set()
+    for thread in clients:
+        thread.join(timeout=5)
+    server.shutdown()
+
+    result = latency.to_dict()
+    queue_stats = backend.get_command_stats()
+    print(f"Kill latency, HTTP receipt -> action.kill(): "
+          f"p50 {result['p50_ms']:.3f} ms, p99 {result['p99_ms']:.3f} ms, "
+          f"max {result['max_ms']:.3f} ms ({result['count']} stops, {missed} missed)")
+    print(f"Moves: {dict(sorted(move_status.items()))} (HTTP status: count); "
+          f"dropped {queue_stats['commands_dropped']}, cancelled {queue_stats['commands_cancelled']}, "
+          f"merged {queue_stats['commands_merged']}")
+    print(f"Telemetry samples replayed: {backend.replay.records_played}")
+    return 1 if missed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())